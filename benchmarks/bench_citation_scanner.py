@@ -0,0 +1,187 @@
+"""
+Measure the citation scanning in the credibility scorer on large documents.
+
+Usage:
+    python benchmarks/bench_citation_scanner.py [--docs N] [--kb SIZE] [--seed S]
+
+Generates N synthetic articles of about SIZE KB each, with citation
+phrases and links scattered through filler text, and times:
+
+- the previous presence checks (six re.search calls with re.IGNORECASE,
+  stopping at the first match, plus the "href"/"http" substring scans);
+- counting with the previous patterns (six re.IGNORECASE passes plus
+  str.count for the links), which is what counting occurrences would
+  cost without the scanner;
+- six passes over the lowercased content, one per citation kind;
+- a single alternation pass over the lowercased content, classifying each
+  match by kind (the scanner this module shipped with first);
+- scan_citations, through analyze_source_credibility.
+
+The per-kind counts of scan_citations are checked against the six passes.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer.credibility_scorer import (  # noqa: E402
+    CITATION_KINDS,
+    SCAN_KINDS,
+    analyze_source_credibility,
+    scan_citations,
+)
+
+PREVIOUS_PATTERNS = [
+    r"according to [A-Z][a-z]+",
+    r"cited [A-Z][a-z]+",
+    r"reported by",
+    r"study (by|from|in)",
+    r"research (by|from|in)",
+    r"source[s]?:",
+]
+
+FILLER = (
+    "the council said on tuesday that the plan would go ahead despite the "
+    "objections raised by residents during a long public meeting in the town "
+    "hall where officials presented figures on costs and expected benefits"
+).split()
+
+CITATIONS = [
+    "according to Reuters",
+    "According to the ministry",
+    "cited Smith",
+    "reported by local media",
+    "a study by the university",
+    "Research from Oxford",
+    "Sources: official records",
+    "source: company filings",
+    '<a href="/news/1">',
+    "https://example.org/report",
+]
+
+
+def make_documents(count, size_kb, seed):
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        words = []
+        length = 0
+        while length < size_kb * 1024:
+            if rng.random() < 0.01:
+                word = rng.choice(CITATIONS)
+            else:
+                word = rng.choice(FILLER)
+                if rng.random() < 0.05:
+                    word = word.capitalize()
+            words.append(word)
+            length += len(word) + 1
+        documents.append(" ".join(words))
+    return documents
+
+
+def previous_presence(content):
+    """The citation and link checks used before the single-pass scanner."""
+    has_links = ("href" in content, "http" in content)
+    citation_count = sum(
+        1 for pattern in PREVIOUS_PATTERNS if re.search(pattern, content, re.IGNORECASE)
+    )
+    return citation_count, has_links
+
+
+def previous_counts(content):
+    """Count occurrences with the previous patterns, one pass per pattern."""
+    counts = [
+        len(re.findall(pattern, content, re.IGNORECASE))
+        for pattern in PREVIOUS_PATTERNS
+    ]
+    return counts, content.count("href"), content.count("http")
+
+
+def separate_counts(content):
+    """Count every citation kind with its own pass over the content."""
+    return {
+        kind: len(re.findall(pattern, content.lower()))
+        for kind, pattern in CITATION_KINDS.items()
+    }
+
+
+ALTERNATION = re.compile("|".join(SCAN_KINDS.values()))
+ALTERNATION_KIND = re.compile(
+    "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in SCAN_KINDS.items())
+)
+
+
+def alternation_counts(content):
+    """Count every kind in one alternation pass, classifying each match text."""
+    lowered = content.lower()
+    counts = dict.fromkeys(SCAN_KINDS, 0)
+    kind_of_text = {}
+    for match in ALTERNATION.finditer(lowered):
+        text = match.group()
+        kind = kind_of_text.get(text)
+        if kind is None:
+            kind = ALTERNATION_KIND.match(lowered, match.start()).lastgroup
+            kind_of_text[text] = kind
+        counts[kind] += 1
+    return counts
+
+
+def timed(function, documents):
+    start = time.perf_counter()
+    results = [function(document) for document in documents]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--kb", type=int, default=200, help="Document size in KB")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs, args.kb, args.seed)
+    megabytes = sum(len(document) for document in documents) / 1e6
+    print(f"Documents: {len(documents)} x ~{args.kb} KB ({megabytes:.0f} MB)")
+
+    previous_time, _ = timed(previous_presence, documents)
+    counting_time, _ = timed(previous_counts, documents)
+    separate_time, separate = timed(separate_counts, documents)
+    alternation_time, _ = timed(alternation_counts, documents)
+    start = time.perf_counter()
+    results = [
+        analyze_source_credibility(f"https://example.org/{i}", {"content": document})
+        for i, document in enumerate(documents)
+    ]
+    scorer_time = time.perf_counter() - start
+
+    for label, elapsed in (
+        ("Previous presence checks", previous_time),
+        ("Previous patterns, counting", counting_time),
+        ("Six lowercased passes", separate_time),
+        ("Single alternation pass", alternation_time),
+        ("scan_citations (scorer)", scorer_time),
+    ):
+        print(
+            f"{label:28} {elapsed:7.2f} s  {megabytes / elapsed:7.1f} MB/s  "
+            f"{len(documents) / elapsed:8.1f} docs/s"
+        )
+
+    mismatches = sum(
+        1
+        for result, expected in zip(results, separate)
+        if result["citation_kinds"] != expected
+    )
+    print(f"Per-kind counts differing from the six passes: {mismatches}")
+    citations = sum(sum(result["citation_kinds"].values()) for result in results)
+    print(f"Citations counted: {citations} ({citations / len(documents):.0f}/doc)")
+    links = sum(scan_citations(documents[0])[kind] for kind in ("href", "http"))
+    print(f"Links in the first document: {links}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Measure body-text extraction quality and speed on saved pages.
+
+Usage:
+    python benchmarks/bench_content_extraction.py [FIXTURES_DIR] [--repeat N]
+
+Every NAME.html page with a NAME.txt file holding its expected body text is
+extracted with the text-density engine (lxml and html.parser trees) and with
+the previous first-container heuristic. Prints word-level precision/recall
+against the expected text and the extraction time per page. Exits with an
+error if the lxml and html.parser trees give different text for any page,
+as both are meant to run the same extraction.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from src.utils.article_fetcher import (  # noqa: E402
+    CONTAINER_SELECTOR,
+    HAVE_LXML,
+    extract_article_bs4,
+    extract_article_lxml,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def first_container_text(html):
+    """The extraction heuristic used before the text-density engine."""
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(["script", "style"]):
+        element.decompose()
+    containers = soup.select(CONTAINER_SELECTOR)
+    paragraphs = (containers[0] if containers else soup).find_all("p")
+    return " ".join(p.get_text().strip() for p in paragraphs)
+
+
+def precision_recall(extracted, expected):
+    got, want = Counter(extracted.split()), Counter(expected.split())
+    overlap = sum((got & want).values())
+    precision = overlap / sum(got.values()) if got else 0.0
+    recall = overlap / sum(want.values()) if want else 0.0
+    return precision, recall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("fixtures", nargs="?", default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = []
+    for path in sorted(glob.glob(os.path.join(args.fixtures, "*.html"))):
+        expected_path = os.path.splitext(path)[0] + ".txt"
+        if not os.path.exists(expected_path):
+            continue
+        with open(path, "rb") as f:
+            html = f.read()
+        with open(expected_path, "r", encoding="utf-8") as f:
+            expected = f.read()
+        cases.append((os.path.basename(path), html, expected))
+
+    if not cases:
+        sys.exit("No fixtures with expected .txt files found")
+
+    extractors = [("first-container", first_container_text)]
+    extractors.append(
+        ("density/html.parser", lambda h: extract_article_bs4(h)["content"])
+    )
+    if HAVE_LXML:
+        extractors.append(
+            ("density/lxml", lambda h: extract_article_lxml(h)["content"])
+        )
+
+    print(f"{'extractor':<22}{'precision':>10}{'recall':>10}{'ms/page':>10}")
+    for name, extract in extractors:
+        scores = [
+            precision_recall(extract(html), expected) for _, html, expected in cases
+        ]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html, _ in cases:
+                extract(html)
+        per_page = (time.perf_counter() - start) / (args.repeat * len(cases)) * 1000
+        precision = sum(p for p, _ in scores) / len(scores)
+        recall = sum(r for _, r in scores) / len(scores)
+        print(f"{name:<22}{precision:>10.2f}{recall:>10.2f}{per_page:>10.2f}")
+
+        for (case, _, _), (p, r) in zip(cases, scores):
+            if p < 0.9 or r < 0.9:
+                print(f"  {case}: precision {p:.2f}, recall {r:.2f}")
+
+    if HAVE_LXML:
+        mismatched = [
+            case
+            for case, html, _ in cases
+            if extract_article_lxml(html)["content"]
+            != extract_article_bs4(html)["content"]
+        ]
+        if mismatched:
+            sys.exit(
+                f"lxml and html.parser extractions differ: {', '.join(mismatched)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Measure the speed of the rule-based headline scoring.
+
+Usage:
+    python benchmarks/bench_headline_matching.py [--count N] [--seed S] [--show N]
+
+Generates N synthetic headlines (default 100000) mixing neutral words with
+lexicon terms, and scores them with the compiled single-regex matcher and
+with the previous per-phrase substring checks. Prints headlines per second
+for both and how many scores differ. Differences come from the matcher
+requiring word boundaries ("almost" no longer counts as "most", "secretary"
+as "secret", "deadline" or "deadliest" as "dead") and from emotional words
+followed by punctuation ("horrifying?"), which the old whitespace split
+missed; --show N prints examples.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer.headline_analyzer import LEXICONS, score_headline  # noqa: E402
+
+NEUTRAL_WORDS = (
+    "council approves budget for new school after long debate over funding "
+    "city water prices rise as drought continues researchers study climate "
+    "data election results show narrow margin minister talks trade deal"
+).split()
+
+# Concrete words for the morbid terms, which are patterns covering inflections
+MORBID_WORDS = (
+    "serial killer|serial killers|murder|murders|murdered|murdering|kill|kills|"
+    "killed|killer|killers|killing|killings|dead|deadly|death|deaths"
+).split("|")
+
+# Words that contain a lexicon term without being one
+NEAR_MISSES = (
+    "moment deadline almost island hackers momentum reporter secretary".split()
+)
+
+PREVIOUS_CLICKBAIT = LEXICONS["clickbait"]
+PREVIOUS_EMOTIONAL = LEXICONS["emotional"]
+
+
+def previous_score(title):
+    """The sensationalism score computed before the compiled matcher."""
+    clickbait_count = sum(
+        1 for phrase in PREVIOUS_CLICKBAIT if phrase.lower() in title.lower()
+    )
+    emotional_count = sum(
+        1 for word in PREVIOUS_EMOTIONAL if word.lower() in title.lower().split()
+    )
+    has_question = bool(
+        re.search(
+            r"\?$|^(who|what|when|where|why|how|is|are|can|will|should|would|could|do|does)",
+            title.lower(),
+            re.IGNORECASE,
+        )
+    )
+    has_number = bool(re.search(r"^\d+|^\d+ ", title))
+    has_superlative = bool(
+        re.search(
+            r"(best|worst|most|biggest|greatest|easiest|deadliest|highest|lowest)",
+            title.lower(),
+        )
+    )
+
+    base_score = 0
+    if clickbait_count > 0:
+        base_score += 20 * min(clickbait_count, 3)
+    if emotional_count > 0:
+        base_score += 15 * min(emotional_count, 3)
+    if has_question:
+        base_score += 10
+    if has_number:
+        base_score += 10
+    if has_superlative:
+        base_score += 15
+    if "news" in title.lower() or any(
+        word in title.lower() for word in ["breaking", "report", "exclusive"]
+    ):
+        base_score += 5
+    if len(title) > 70:
+        base_score += 5
+    if any(word.isupper() and len(word) > 2 for word in title.split()):
+        base_score += 5
+    if any(
+        term in title.lower()
+        for term in ["serial killer", "murder", "kill", "dead", "death"]
+    ):
+        base_score += 25
+    if "mom" in title.lower() and not "moment" in title.lower():
+        base_score += 15
+    return int(min(base_score, 100))
+
+
+def make_headlines(count, seed):
+    rng = random.Random(seed)
+    terms = [
+        term
+        for category, words in LEXICONS.items()
+        if category != "morbid"
+        for term in words
+    ] + MORBID_WORDS
+    headlines = []
+    for _ in range(count):
+        words = rng.choices(NEUTRAL_WORDS, k=rng.randint(5, 12))
+        for _ in range(rng.choice((0, 0, 1, 1, 2, 3))):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(terms))
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(NEAR_MISSES))
+        if rng.random() < 0.2:
+            words.insert(0, str(rng.randint(3, 25)))
+        if rng.random() < 0.1:
+            words[rng.randrange(len(words))] = rng.choice(words).upper()
+        title = " ".join(words).capitalize()
+        if rng.random() < 0.15:
+            title += "?"
+        headlines.append(title)
+    return headlines
+
+
+def time_scoring(score, headlines):
+    start = time.perf_counter()
+    scores = [score(title) for title in headlines]
+    return time.perf_counter() - start, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--show",
+        type=int,
+        default=0,
+        help="Print up to N headlines whose score changed",
+    )
+    args = parser.parse_args()
+
+    headlines = make_headlines(args.count, args.seed)
+    old_time, old_scores = time_scoring(previous_score, headlines)
+    new_time, new_scores = time_scoring(
+        lambda title: score_headline(title)["sensationalism_score"], headlines
+    )
+
+    print(f"Headlines: {len(headlines)}")
+    for label, elapsed in (
+        ("Substring checks", old_time),
+        ("Compiled matcher", new_time),
+    ):
+        print(
+            f"{label}: {elapsed:6.2f} s  {len(headlines) / elapsed:10.0f} headlines/s"
+        )
+    print(f"Speedup: {old_time / new_time:.2f}x")
+
+    changed = [
+        (title, old, new)
+        for title, old, new in zip(headlines, old_scores, new_scores)
+        if old != new
+    ]
+    print(
+        f"Scores changed: {len(changed)} "
+        f"({100 * len(changed) / len(headlines):.1f}%)"
+    )
+    for title, old, new in changed[: args.show]:
+        print(f"  {old:3d} -> {new:3d}  {title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare the lxml fast path against the BeautifulSoup html.parser path.
+
+Usage:
+    python benchmarks/bench_html_parsing.py [PAGES_DIR ...] [--repeat N]
+
+Each directory is scanned for saved *.html pages (default: benchmarks/fixtures).
+Prints per-page extraction time for both paths, the overall speedup and
+whether both paths produced identical results.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.article_fetcher import (  # noqa: E402
+    HAVE_LXML,
+    extract_article_bs4,
+    extract_article_lxml,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def time_extraction(extract, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            extract(html)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dirs", nargs="*", default=[FIXTURES_DIR])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if not HAVE_LXML:
+        sys.exit("lxml is not installed; install it to benchmark the fast path")
+
+    paths = sorted(p for d in args.dirs for p in glob.glob(os.path.join(d, "*.html")))
+    if not paths:
+        sys.exit("No *.html pages found")
+
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+
+    mismatches = [
+        path
+        for path, html in zip(paths, pages)
+        if extract_article_lxml(html) != extract_article_bs4(html)
+    ]
+
+    bs4_time = time_extraction(extract_article_bs4, pages, args.repeat)
+    lxml_time = time_extraction(extract_article_lxml, pages, args.repeat)
+    total_kb = sum(len(html) for html in pages) / 1024
+
+    print(f"Pages: {len(pages)} ({total_kb:.0f} KB), repeat: {args.repeat}")
+    print(f"html.parser: {bs4_time * 1000:8.2f} ms/page")
+    print(f"lxml:        {lxml_time * 1000:8.2f} ms/page")
+    print(f"Speedup:     {bs4_time / lxml_time:8.1f}x")
+    print(f"Identical results: {len(pages) - len(mismatches)}/{len(pages)}")
+    for path in mismatches:
+        print(f"  differs: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Check that starting main.py stays within an import-time budget.
+
+Usage:
+    python benchmarks/bench_import_time.py [--budget MS] [--repeat N]
+
+Runs `python -X importtime main.py --help` (best of N runs), prints the
+slowest modules imported by the project and exits with status 1 if the
+total import time is over budget or if a heavy dependency that should only
+be loaded by the stage that needs it (langchain, bs4, lxml, requests) was
+imported.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must not be imported just to start the program
+LAZY_MODULES = ("langchain", "langchain_google_genai", "bs4", "lxml", "requests")
+
+
+def import_times(repeat):
+    """Return {module: cumulative microseconds} for the fastest of `repeat` runs."""
+    best, best_total = None, None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "main.py", "--help"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or line.count("|") != 2:
+                continue
+            _, cumulative, name = line.split("|")
+            if not cumulative.strip().isdigit():
+                continue  # the header line
+            # Nested imports are indented by two spaces per level
+            times.setdefault(name[1:].rstrip(), int(cumulative))
+        total = sum(_top_level(times).values())
+        if best is None or total < best_total:
+            best, best_total = times, total
+    return best
+
+
+def _top_level(times):
+    return {name: us for name, us in times.items() if not name.startswith(" ")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--budget", type=float, default=300.0, help="Budget in ms (default: 300)"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    times = import_times(args.repeat)
+    top_level = _top_level(times)
+    total_ms = sum(top_level.values()) / 1000
+
+    print("Slowest top-level imports:")
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:8]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    print(f"Total import time: {total_ms:.1f} ms (budget {args.budget:.0f} ms)")
+
+    loaded = sorted(
+        {name.strip() for name in times if name.strip().split(".")[0] in LAZY_MODULES}
+    )
+    failed = False
+    if loaded:
+        roots = sorted({name.split(".")[0] for name in loaded})
+        print(f"FAIL: heavy dependencies imported at startup: {', '.join(roots)}")
+        failed = True
+    if total_ms > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measure the throughput of the offline (heuristic-only) analysis engine.
+
+Usage:
+    python benchmarks/bench_offline_analysis.py [TEXT_DIR ...] [--repeat N] [--show]
+
+Every *.txt file in the directories (default: benchmarks/fixtures) is
+analyzed as an article body. Prints the time per article and articles per
+minute on one core, and the time for one long article made by concatenating
+all inputs (to check that the cost grows linearly with article length).
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer.offline_analyzer import analyze_offline  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dirs", nargs="*", default=[FIXTURES_DIR])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--show", action="store_true", help="Print each analysis")
+    args = parser.parse_args()
+
+    paths = sorted(p for d in args.dirs for p in glob.glob(os.path.join(d, "*.txt")))
+    if not paths:
+        sys.exit("No *.txt articles found")
+
+    articles = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        articles.append({"title": os.path.basename(path), "content": content})
+
+    if args.show:
+        for article in articles:
+            print(f"== {article['title']}")
+            print(json.dumps(analyze_offline(article), indent=2, ensure_ascii=False))
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for article in articles:
+            analyze_offline(article)
+    per_article = (time.perf_counter() - start) / (args.repeat * len(articles))
+    words = sum(len(article["content"].split()) for article in articles) / len(articles)
+
+    print(f"Articles: {len(articles)} (avg {words:.0f} words), repeat: {args.repeat}")
+    print(f"Offline analysis: {per_article * 1000:8.2f} ms/article")
+    print(f"Throughput:       {60 / per_article:8.0f} articles/min on one core")
+
+    long_article = {
+        "title": "long",
+        "content": "\n\n".join(article["content"] for article in articles) * 20,
+    }
+    repeat = max(1, args.repeat // 20)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        analyze_offline(long_article)
+    long_time = (time.perf_counter() - start) / repeat
+    print(
+        f"Long article ({len(long_article['content'].split())} words): "
+        f"{long_time * 1000:8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,91 @@
 import argparse
+import hashlib
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from src.utils.article_fetcher import fetch_article_content, read_article_from_file
-from src.analyzer.content_analyzer import analyze_article
-from src.utils.report_generator import generate_markdown_report, save_report
+from src.analyzer.content_analyzer import (
+    DEFAULT_CHUNK_TOKENS,
+    analyze_article,
+    analyze_article_batch,
+    analyze_article_stream,
+)
+from src.utils.report_generator import (
+    ProgressiveReportWriter,
+    generate_markdown_report,
+    save_report,
+)
 from src.analyzer.credibility_scorer import analyze_source_credibility
-from src.analyzer.headline_analyzer import analyze_headline
+from src.analyzer.offline_analyzer import analyze_offline
+from src.analyzer.cascade import (
+    LLM,
+    LOCAL,
+    REDUCED,
+    configure_cascade,
+    get_cascade,
+    get_cascade_stats,
+)
+from src.utils.text_processor import estimate_tokens
+from src.analyzer.headline_analyzer import (
+    analyze_headline,
+    analyze_headline_batch,
+    analyze_headlines,
+)
+from src.analyzer.engine import configure_hedging, get_hedge_stats
+from src.analyzer.headline_model import (
+    DEFAULT_MODEL_PATH,
+    configure_headline_classifier,
+    train_headline_model,
+)
 from src.analyzer.comparative_analyzer import (
     find_related_articles,
     compare_article_perspectives,
 )
 from src.utils.html_generator import generate_html_report, save_html_report
+from src.utils.http_client import configure_http_client, get_connection_stats
+from src.utils.page_cache import configure_page_cache, get_page_cache_stats
+from src.utils.llm_cache import configure_llm_cache, get_llm_cache_stats
+from src.utils.domain_reputation import configure_domain_reputation
+from src.utils.rate_limiter import configure_rate_limiter, get_rate_limiter_stats
+from src.utils.circuit_breaker import configure_circuit_breaker, get_circuit_breaker
 
 load_dotenv()
 
+REPORTS_DIR = "analysis_reports"
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Digital Skeptic - A critical thinking AI assistant for news articles"
-    )
-    parser.add_argument("url", help="URL of the news article to analyze")
-    parser.add_argument(
-        "--output",
-        "-o",
-        help="Output file path for the analysis report",
-    )
-    parser.add_argument(
-        "--local",
-        "-l",
-        help="Path to local file containing article text (used if URL scraping fails)",
-    )
-    parser.add_argument(
-        "--html",
-        action="store_true",
-        help="Generate an interactive HTML report in addition to Markdown",
-    )
-    parser.add_argument(
-        "--compare",
-        action="store_true",
-        help="Perform comparative analysis with other articles on the same topic",
-    )
-    parser.add_argument(
-        "--verbose",
-        "-v",
-        action="store_true",
-        help="Print detailed debug information during processing",
-    )
 
-    args = parser.parse_args()
-    verbose = args.verbose
+def read_batch_urls(source):
+    """
+    Read the list of URLs for batch mode.
 
-    # Create analysis_reports directory if it doesn't exist
-    reports_dir = "analysis_reports"
-    os.makedirs(reports_dir, exist_ok=True)
+    Args:
+        source: Path to a file with one URL per line, or "-" to read from stdin
+
+    Returns:
+        list: URLs in input order, skipping blank lines and "#" comments
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    return [
+        line.strip()
+        for line in lines
+        if line.strip() and not line.strip().startswith("#")
+    ]
 
-    # Fetch article content
-    print("Fetching article content...")
-    article_data = fetch_article_content(args.url)
 
-    local_file = args.local or "local.txt"
+def load_article(url, local_file="local.txt"):
+    """Fetch the article, falling back to a local file and prompting the user."""
+    print("Fetching article content...")
+    article_data = fetch_article_content(url)
 
     if not article_data:
-        print(f"Failed to fetch article from URL: {args.url}")
+        print(f"Failed to fetch article from URL: {url}")
 
         # Check if the local file exists and has content
         if os.path.exists(local_file) and os.path.getsize(local_file) > 0:
@@ -92,39 +116,199 @@ def main():
             # Read from the local file
             article_data = read_article_from_file(local_file)
 
-    if not article_data:
-        print("Failed to obtain article content. Exiting.")
-        return
+    return article_data
 
-    # Add credibility analysis
-    print("Analyzing source credibility...")
-    credibility_info = analyze_source_credibility(args.url, article_data)
 
-    # Add headline analysis
-    print("Analyzing headline...")
-    headline_info = analyze_headline(article_data, verbose=verbose)
+def run_comparison(article_data, max_articles=3, max_workers=None):
+    """
+    Find related articles and compare their perspectives with the original.
 
-    # Comparative analysis (optional)
-    comparative_info = None
-    if args.compare:
-        print("Finding related articles for comparison...")
-        related_articles = find_related_articles(article_data)
-        if related_articles:
-            print(
-                f"Found {len(related_articles)} related articles. Comparing perspectives..."
+    The related pages are fetched concurrently, by default all at once (up
+    to comparative_analyzer.MAX_FETCH_WORKERS), so fetching takes about as
+    long as the slowest page however many are compared; max_workers lowers
+    that limit.
+    """
+    print("Finding related articles for comparison...")
+    related_articles = find_related_articles(article_data, max_articles=max_articles)
+    if not related_articles:
+        print("No related articles found for comparison.")
+        return None
+
+    print(f"Found {len(related_articles)} related articles. Comparing perspectives...")
+    return compare_article_perspectives(
+        article_data, related_articles, max_workers=max_workers
+    )
+
+
+def run_analysis(
+    url,
+    article_data,
+    compare=False,
+    max_related=3,
+    chunk_tokens=DEFAULT_CHUNK_TOKENS,
+    combined=False,
+    on_section=None,
+    offline=False,
+    verbose=False,
+):
+    """
+    Run the credibility, headline, comparative and content analysis stages.
+
+    The stages only depend on the fetched article, so they are scheduled
+    concurrently and joined before the results are merged. Wall time is
+    roughly that of the slowest stage rather than the sum of all of them.
+
+    When the cascade is enabled (see configure_cascade), credibility and the
+    rule-based headline score are computed first; articles they show to be
+    clearly clean or clearly junk skip the LLM stages or get a shortened
+    prompt.
+
+    Args:
+        url: The URL of the article
+        article_data: Dictionary containing article information
+        compare: Whether to run the comparative analysis stage
+        max_related: Maximum number of related articles to compare against
+        chunk_tokens: Token threshold above which content is analyzed in chunks
+        combined: Request the headline critique as part of the content analysis
+            instead of in a separate LLM call
+        on_section: Optional callback(key, value); when given, the content
+            analysis is streamed and each component is passed to it as soon
+            as it is complete
+        offline: Analyze with the local heuristic engine only, without any
+            LLM calls (this also skips the comparative analysis)
+        verbose: Print detailed debug information
+
+    Returns:
+        tuple: (analysis dict, credibility info dict)
+    """
+    route = LOCAL if offline else LLM
+    credibility_info = local_headline = None
+    cascade = get_cascade()
+    if cascade.enabled and not offline:
+        # Cheap local signals run first and decide whether the LLM is needed
+        print("Screening with local signals...")
+        credibility_info = analyze_source_credibility(url, article_data)
+        local_headline = analyze_headline(article_data, verbose=verbose, use_llm=False)
+        decision = cascade.route(article_data, local_headline, credibility_info)
+        route = decision["route"]
+        print(
+            f"Local screening: {decision['verdict']} (risk {decision['risk']:.2f}), "
+            f"route: {route}"
+        )
+        record_cascade_route(cascade, decision, article_data, compare, combined)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        if credibility_info is None:
+            print("Analyzing source credibility...")
+            credibility_future = executor.submit(
+                analyze_source_credibility, url, article_data
+            )
+
+        print("Analyzing headline...")
+        headline_llm = route == LLM and not combined
+        if local_headline is not None and not headline_llm:
+            headline_future = None
+        else:
+            headline_future = executor.submit(
+                analyze_headline, article_data, verbose=verbose, use_llm=headline_llm
+            )
+
+        # Comparative analysis (optional)
+        comparative_future = (
+            executor.submit(run_comparison, article_data, max_related)
+            if compare and route == LLM
+            else None
+        )
+
+        # Main article analysis
+        print("Analyzing article content...")
+        if route == LOCAL:
+            analysis_future = executor.submit(analyze_offline, article_data)
+        elif route == REDUCED:
+            analysis_future = executor.submit(
+                analyze_article,
+                cascade.reduce(article_data),
+                verbose=verbose,
+                chunk_tokens=0,
+                include_headline=combined,
             )
-            comparative_info = compare_article_perspectives(
-                article_data, related_articles
+        elif on_section:
+            analysis_future = executor.submit(
+                analyze_article_stream,
+                article_data,
+                on_section,
+                verbose=verbose,
+                chunk_tokens=chunk_tokens,
+                include_headline=combined,
             )
         else:
-            print("No related articles found for comparison.")
+            analysis_future = executor.submit(
+                analyze_article,
+                article_data,
+                verbose=verbose,
+                chunk_tokens=chunk_tokens,
+                include_headline=combined,
+            )
+
+        if credibility_info is None:
+            credibility_info = credibility_future.result()
+        headline_info = headline_future.result() if headline_future else local_headline
+        comparative_info = comparative_future.result() if comparative_future else None
+        analysis = analysis_future.result()
+
+    if route != LLM and not offline:
+        add_cascade_note(credibility_info, decision)
+
+    merge_stage_results(analysis, headline_info, comparative_info, combined, verbose)
+    return analysis, credibility_info
+
+
+def record_cascade_route(cascade, decision, article_data, compare, combined):
+    """Count the LLM calls and prompt tokens a cascade decision avoids."""
+    route = decision["route"]
+    if route == LLM:
+        cascade.record(route)
+        return
+
+    # The separate headline critique and the comparison are always skipped
+    calls_skipped = (0 if combined else 1) + (1 if compare else 0)
+    content_tokens = estimate_tokens(article_data.get("content") or "")
+    if route == LOCAL:
+        calls_skipped += 1
+        tokens_saved = content_tokens
+    else:
+        reduced = cascade.reduce(article_data)["content"]
+        tokens_saved = content_tokens - estimate_tokens(reduced)
+    cascade.record(route, calls_skipped, tokens_saved)
+
+
+def add_cascade_note(credibility_info, decision):
+    """Note in the credibility factors when the cascade skipped the full analysis."""
+    if decision["route"] == LLM:
+        return
+    outcome = (
+        "LLM analysis skipped"
+        if decision["route"] == LOCAL
+        else "analyzed with a shortened LLM prompt"
+    )
+    credibility_info["credibility_factors"].append(
+        f"Screened as likely {decision['verdict']} by local signals "
+        f"(risk {decision['risk']:.2f}); {outcome}"
+    )
 
-    # Main article analysis
-    print("Analyzing article content...")
-    analysis = analyze_article(article_data, verbose=verbose)
 
-    # Add headline analysis to the overall analysis
-    analysis["headline_analysis"] = headline_info.get("headline_analysis")
+def merge_stage_results(
+    analysis, headline_info, comparative_info, combined=False, verbose=False
+):
+    """Add the headline and comparative stage results to the content analysis."""
+    # Add headline analysis to the overall analysis, preferring the critique
+    # from the combined request when there was one
+    headline_analysis = analysis.get("headline_analysis") if combined else None
+    if isinstance(headline_analysis, list):
+        headline_analysis = "\n".join(str(item) for item in headline_analysis)
+    analysis["headline_analysis"] = headline_analysis or headline_info.get(
+        "headline_analysis"
+    )
     analysis["sensationalism_score"] = headline_info.get(
         "sensationalism_score", 0
     )  # Default to 0 if not present
@@ -140,8 +324,645 @@ def main():
         analysis["comparative_analysis"] = comparative_info.get("perspective_analysis")
         analysis["related_articles"] = comparative_info.get("related_articles")
 
+
+def write_reports(
+    article_data, analysis, credibility_info, output_path, html=False, verbose=False
+):
+    """Generate and save the Markdown report, plus the HTML report if requested."""
+    print("Generating report...")
+    report = generate_markdown_report(
+        article_data, analysis, credibility_info, verbose=verbose
+    )
+    save_report(report, output_path)
+
+    if html:
+        html_path = os.path.splitext(output_path)[0] + ".html"
+        print("Generating interactive HTML report...")
+        html_report = generate_html_report(article_data, analysis, credibility_info)
+        save_html_report(html_report, html_path)
+        print(f"HTML report saved to {html_path}")
+
+
+def default_report_path(article_data, reports_dir=REPORTS_DIR, url=None):
+    """
+    Build the Markdown report path from the article title.
+
+    In batch mode the url is given, and a short hash of it is appended so
+    articles with the same title (or none, "Unknown Title") do not
+    overwrite each other's reports.
+    """
+    safe_title = "".join(c if c.isalnum() else "_" for c in article_data["title"][:50])
+    if url:
+        safe_title += "_" + hashlib.sha256(url.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(reports_dir, f"{safe_title}.md")
+
+
+def process_batch_url(url, args, reports_dir):
+    """
+    Run the full pipeline for one URL in batch mode, without any prompts.
+
+    Returns:
+        str: Path of the saved Markdown report
+
+    Raises:
+        RuntimeError: If the article could not be fetched
+    """
+    article_data = fetch_article_content(url)
+    if not article_data:
+        raise RuntimeError("failed to fetch article")
+
+    analysis, credibility_info = run_analysis(
+        url,
+        article_data,
+        compare=args.compare,
+        max_related=args.max_related,
+        chunk_tokens=args.chunk_tokens,
+        combined=args.combined,
+        offline=args.offline,
+        verbose=args.verbose,
+    )
+    output_path = default_report_path(article_data, reports_dir, url=url)
+    write_reports(
+        article_data,
+        analysis,
+        credibility_info,
+        output_path,
+        html=args.html,
+        verbose=args.verbose,
+    )
+    return output_path
+
+
+def run_batch(urls, args, reports_dir):
+    """
+    Analyze many URLs in one process with a bounded pool of workers.
+
+    Prints one status line per article as it finishes and a throughput
+    summary at the end.
+
+    Returns:
+        int: Number of articles that failed
+    """
+    total = len(urls)
+    workers = max(1, min(args.workers, total or 1))
+    print(f"Batch mode: {total} URLs with {workers} workers")
+
+    succeeded = 0
+    failed = 0
+    batch_start = time.perf_counter()
+
+    def timed(url):
+        start = time.perf_counter()
+        try:
+            return process_batch_url(url, args, reports_dir), None, start
+        except Exception as e:
+            return None, e, start
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(timed, url): url for url in urls}
+        for done, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            output_path, error, start = future.result()
+            elapsed = time.perf_counter() - start
+            if error is None:
+                succeeded += 1
+                print(f"[{done}/{total}] OK   {elapsed:6.1f}s {url} -> {output_path}")
+            else:
+                failed += 1
+                print(f"[{done}/{total}] FAIL {elapsed:6.1f}s {url}: {error}")
+
+    total_time = time.perf_counter() - batch_start
+    rate = total / total_time * 60 if total_time > 0 else 0.0
+    print(
+        f"Batch complete: {succeeded} succeeded, {failed} failed, "
+        f"{total} total in {total_time:.1f}s ({rate:.1f} articles/min)"
+    )
+    if get_cascade().enabled:
+        print_cascade_stats()
+    return failed
+
+
+def run_llm_batch(urls, args, reports_dir):
+    """
+    Batch mode variant that sends the LLM requests of all articles together.
+
+    Articles are fetched concurrently, then content and headline analyses
+    for every article go through the LLM batch API instead of one request
+    per article. Credibility and comparison stages still run per article,
+    and the cascade (if enabled) keeps clearly clean or junk articles out of
+    the batch.
+
+    Returns:
+        int: Number of articles that failed
+    """
+    total = len(urls)
+    workers = max(1, min(args.workers, total or 1))
+    print(f"Batch mode: {total} URLs, LLM requests batched {args.llm_batch} at a time")
+    batch_start = time.perf_counter()
+
+    def fetch(url):
+        try:
+            return fetch_article_content(url)
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = list(executor.map(fetch, urls))
+
+    failed = 0
+    done = 0
+    articles = []
+    for url, article_data in zip(urls, fetched):
+        if article_data:
+            articles.append((url, article_data))
+        else:
+            done += 1
+            failed += 1
+            print(f"[{done}/{total}] FAIL {url}: failed to fetch article")
+
+    # Cheap local stages first; with the cascade on they also pick the route
+    cascade = get_cascade()
+    credibility = [
+        analyze_source_credibility(url, article_data) for url, article_data in articles
+    ]
+    local_headlines = analyze_headlines(
+        [article_data.get("title", "") for _, article_data in articles]
+    )
+    decisions = []
+    for i, (url, article_data) in enumerate(articles):
+        decision = {"route": LLM}
+        if cascade.enabled:
+            decision = cascade.route(article_data, local_headlines[i], credibility[i])
+            record_cascade_route(
+                cascade, decision, article_data, args.compare, args.combined
+            )
+            add_cascade_note(credibility[i], decision)
+        decisions.append(decision)
+
+    llm_indexes = [i for i, d in enumerate(decisions) if d["route"] != LOCAL]
+    headline_indexes = [
+        i for i in llm_indexes if decisions[i]["route"] == LLM and not args.combined
+    ]
+    with ThreadPoolExecutor(max_workers=workers + 2) as executor:
+        analyses_future = executor.submit(
+            analyze_article_batch,
+            [
+                (
+                    articles[i][1]
+                    if decisions[i]["route"] == LLM
+                    else cascade.reduce(articles[i][1])
+                )
+                for i in llm_indexes
+            ],
+            verbose=args.verbose,
+            chunk_tokens=args.chunk_tokens,
+            include_headline=args.combined,
+            batch_size=args.llm_batch,
+            max_concurrency=workers,
+        )
+        headlines_future = executor.submit(
+            analyze_headline_batch,
+            [articles[i][1] for i in headline_indexes],
+            verbose=args.verbose,
+            batch_size=args.llm_batch,
+            max_concurrency=workers,
+        )
+        comparative_futures = [
+            (
+                executor.submit(run_comparison, article_data, args.max_related)
+                if args.compare and decision["route"] == LLM
+                else None
+            )
+            for (_, article_data), decision in zip(articles, decisions)
+        ]
+
+        analyses = [None] * len(articles)
+        for i, analysis in zip(llm_indexes, analyses_future.result()):
+            analyses[i] = analysis
+        headlines = list(local_headlines)
+        for i, headline_info in zip(headline_indexes, headlines_future.result()):
+            headlines[i] = headline_info
+
+        for i, (url, article_data) in enumerate(articles):
+            done += 1
+            try:
+                analysis = analyses[i] or analyze_offline(article_data)
+                comparative_future = comparative_futures[i]
+                merge_stage_results(
+                    analysis,
+                    headlines[i],
+                    comparative_future.result() if comparative_future else None,
+                    args.combined,
+                    args.verbose,
+                )
+                output_path = default_report_path(article_data, reports_dir, url=url)
+                write_reports(
+                    article_data,
+                    analysis,
+                    credibility[i],
+                    output_path,
+                    html=args.html,
+                    verbose=args.verbose,
+                )
+                print(f"[{done}/{total}] OK   {url} -> {output_path}")
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{total}] FAIL {url}: {e}")
+
+    total_time = time.perf_counter() - batch_start
+    rate = total / total_time * 60 if total_time > 0 else 0.0
+    print(
+        f"Batch complete: {total - failed} succeeded, {failed} failed, "
+        f"{total} total in {total_time:.1f}s ({rate:.1f} articles/min)"
+    )
+    if get_cascade().enabled:
+        print_cascade_stats()
+    return failed
+
+
+def print_cascade_stats():
+    """Print how many articles the cascade handled without the full LLM path."""
+    stats = get_cascade_stats()
+    print(
+        f"Cascade: {stats['local']}/{stats['articles']} articles handled locally "
+        f"({stats['local_fraction']:.0%}), {stats['reduced']} with a shortened prompt, "
+        f"{stats['llm']} escalated to the LLM; {stats['calls_skipped']} LLM calls "
+        f"and {stats['tokens_saved']} prompt tokens saved "
+        f"(~{stats['api_seconds_saved']:.0f}s of API time)"
+    )
+
+
+def parse_cascade_band(spec):
+    """Parse a LOW:HIGH risk band for the cascade."""
+    try:
+        low, high = (float(value) for value in spec.split(":", 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid --cascade-band '{spec}', expected LOW:HIGH"
+        )
+    if not 0 <= low < high <= 1:
+        raise argparse.ArgumentTypeError(
+            f"Invalid --cascade-band '{spec}', expected 0 <= LOW < HIGH <= 1"
+        )
+    return low, high
+
+
+def parse_model_limits(specs):
+    """Parse MODEL=RPM:TPM strings into {model: (rpm, tpm)}."""
+    limits = {}
+    for spec in specs or []:
+        try:
+            model, budget = spec.split("=", 1)
+            rpm, tpm = budget.split(":", 1)
+            limits[model.strip()] = (int(rpm), int(tpm))
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Invalid --model-limit '{spec}', expected MODEL=RPM:TPM"
+            )
+    return limits
+
+
+def print_run_stats():
+    """Print resource usage counters collected during the run (verbose mode)."""
+    http_stats = get_connection_stats()
+    print(
+        f"HTTP: {http_stats['requests_sent']} requests, "
+        f"{http_stats['connections_opened']} connections opened, "
+        f"{http_stats['connections_reused']} reused"
+    )
+    page_stats = get_page_cache_stats()
+    print(
+        f"Page cache: {page_stats['hits']} hits, "
+        f"{page_stats['revalidated']} revalidated, {page_stats['misses']} misses, "
+        f"{page_stats['evicted']} evicted"
+    )
+    llm_stats = get_llm_cache_stats()
+    print(
+        f"LLM cache: {llm_stats['hits']} hits, {llm_stats['misses']} misses, "
+        f"{llm_stats['evicted']} evicted"
+    )
+    limiter_stats = get_rate_limiter_stats()
+    print(
+        f"LLM rate limiter: {limiter_stats['calls']} calls, "
+        f"{limiter_stats['throttled']} throttled for "
+        f"{limiter_stats['wait_seconds']:.1f}s in total"
+    )
+    hedge_stats = get_hedge_stats()
+    if hedge_stats["requests"]:
+        print(
+            f"Hedging: {hedge_stats['hedged']} of {hedge_stats['requests']} requests "
+            f"hedged, {hedge_stats['hedge_wins']} won by the hedge"
+        )
+    model_states = get_circuit_breaker().states()
+    if model_states:
+        print(
+            "Model health: "
+            + ", ".join(f"{model} {state}" for model, state in model_states.items())
+        )
+
+
+def train_and_save_headline_model(path):
+    """Train the headline classifier on the saved reports and print a summary."""
+    try:
+        classifier = train_headline_model(REPORTS_DIR, path)
+    except ValueError as e:
+        print(f"Could not train the headline model: {e}")
+        sys.exit(1)
+    info = classifier.info
+    print(f"Trained on {info['examples']} reports from {REPORTS_DIR}/")
+    for label in classifier.labels:
+        print(
+            f"  {label:15} {info['positives'][label]:5d} positive, "
+            f"training accuracy {info['training_accuracy'][label]:.1%}"
+        )
+    print(f"Model saved to {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Digital Skeptic - A critical thinking AI assistant for news articles"
+    )
+    parser.add_argument("url", nargs="?", help="URL of the news article to analyze")
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Output file path for the analysis report (output directory in batch mode)",
+    )
+    parser.add_argument(
+        "--local",
+        "-l",
+        help="Path to local file containing article text (used if URL scraping fails)",
+    )
+    parser.add_argument(
+        "--html",
+        action="store_true",
+        help="Generate an interactive HTML report in addition to Markdown",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Perform comparative analysis with other articles on the same topic",
+    )
+    parser.add_argument(
+        "--max-related",
+        type=int,
+        default=3,
+        help="Maximum number of related articles fetched for --compare (default: 3)",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_CHUNK_TOKENS,
+        help="Analyze articles longer than this many tokens in concurrent chunks "
+        f"(default: {DEFAULT_CHUNK_TOKENS}, 0 to disable)",
+    )
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="Ask for the headline critique in the main analysis request (one LLM call instead of two)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the content analysis, writing each section to the report and stdout as soon as it is ready",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Analyze with the local heuristic engine only, without any LLM calls (used automatically when GOOGLE_API_KEY is not set)",
+    )
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="Only send articles to the LLM when cheap local signals are inconclusive",
+    )
+    parser.add_argument(
+        "--cascade-band",
+        type=parse_cascade_band,
+        default=(0.15, 0.7),
+        metavar="LOW:HIGH",
+        help="Local risk scores at or below LOW (clearly clean) or at or above HIGH (clearly junk) skip the full LLM analysis (default: 0.15:0.7)",
+    )
+    parser.add_argument(
+        "--cascade-action",
+        choices=["local", "reduced"],
+        default="local",
+        help="What confidently classified articles get: the offline analysis ('local', default) or one shortened LLM prompt ('reduced')",
+    )
+    parser.add_argument(
+        "--headline-model",
+        nargs="?",
+        const=DEFAULT_MODEL_PATH,
+        metavar="FILE",
+        help=f"Assess headlines with the locally trained classifier instead of an LLM critique (default file: {DEFAULT_MODEL_PATH})",
+    )
+    parser.add_argument(
+        "--train-headline-model",
+        action="store_true",
+        help="Train the headline classifier from the reports in analysis_reports/, save it to --headline-model (or the default file) and exit",
+    )
+    parser.add_argument(
+        "--domain-list",
+        metavar="FILE",
+        help="CSV or JSON list of domain reputations used for source credibility (default: the bundled src/data/domain_reputation.csv)",
+    )
+    parser.add_argument(
+        "--batch",
+        "-b",
+        metavar="FILE",
+        help="Analyze every URL listed in FILE (one per line, '-' for stdin) without prompting",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=4,
+        help="Number of articles analyzed concurrently in batch mode (default: 4)",
+    )
+    parser.add_argument(
+        "--llm-batch",
+        type=int,
+        default=0,
+        metavar="SIZE",
+        help="In batch mode, send the LLM requests of all articles through the batch API, SIZE prompts per call (default: off)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=20.0,
+        help="Read timeout in seconds for article and search page requests (default: 20)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries with backoff for failed or rate-limited page requests (default: 3)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk page cache",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-download pages even if cached, then update the cache",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always send requests to the model instead of reusing cached responses",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=60,
+        help="Maximum LLM requests per minute per model (default: 60, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=int,
+        default=1000000,
+        help="Maximum prompt tokens per minute per model (default: 1000000, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--model-limit",
+        action="append",
+        metavar="MODEL=RPM:TPM",
+        help="Per-model override of --rpm/--tpm (may be repeated)",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=3,
+        help="Consecutive failures before a model is skipped (default: 3)",
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=120.0,
+        help="Seconds before a skipped model is probed again (default: 120)",
+    )
+    parser.add_argument(
+        "--breaker-state",
+        metavar="FILE",
+        help="Persist model health to FILE so it carries over between runs",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Send a duplicate request to the next model when the first one is slow",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=95,
+        help="Hedge once a request takes longer than this latency percentile (default: 95)",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Print detailed debug information during processing",
+    )
+
+    args = parser.parse_args()
+    verbose = args.verbose
+
+    if args.train_headline_model:
+        train_and_save_headline_model(args.headline_model or DEFAULT_MODEL_PATH)
+        return
+
+    if not args.url and not args.batch:
+        parser.error("either a URL or --batch FILE is required")
+
+    if not args.offline and not os.environ.get("GOOGLE_API_KEY"):
+        print("GOOGLE_API_KEY is not set; using the offline analysis (--offline).")
+        args.offline = True
+
+    configure_http_client(read_timeout=args.timeout, retries=args.retries)
+    configure_page_cache(enabled=not args.no_cache, refresh=args.refresh)
+    configure_llm_cache(enabled=not args.no_llm_cache)
+    try:
+        model_limits = parse_model_limits(args.model_limit)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    configure_rate_limiter(args.rpm, args.tpm, model_limits)
+    configure_circuit_breaker(
+        args.breaker_threshold, args.breaker_cooldown, args.breaker_state
+    )
+    configure_cascade(
+        enabled=args.cascade,
+        clean_below=args.cascade_band[0],
+        junk_above=args.cascade_band[1],
+        action=args.cascade_action,
+    )
+    if args.hedge:
+        configure_hedging(percentile=args.hedge_percentile)
+    if args.domain_list:
+        if not os.path.exists(args.domain_list):
+            parser.error(f"domain list not found: {args.domain_list}")
+        configure_domain_reputation(source_path=args.domain_list)
+    if args.headline_model:
+        try:
+            configure_headline_classifier(args.headline_model)
+        except (OSError, ValueError) as e:
+            parser.error(
+                f"cannot load headline model {args.headline_model}: {e} "
+                "(train one with --train-headline-model)"
+            )
+
+    # Create analysis_reports directory if it doesn't exist
+    reports_dir = REPORTS_DIR
+    os.makedirs(reports_dir, exist_ok=True)
+
+    if args.batch:
+        if args.output:
+            reports_dir = args.output
+            os.makedirs(reports_dir, exist_ok=True)
+        urls = read_batch_urls(args.batch)
+        if args.llm_batch > 0 and not args.offline:
+            failed = run_llm_batch(urls, args, reports_dir)
+        else:
+            failed = run_batch(urls, args, reports_dir)
+        if verbose:
+            print_run_stats()
+        sys.exit(1 if failed else 0)
+
+    # Fetch article content
+    article_data = load_article(args.url, args.local or "local.txt")
+
+    if not article_data:
+        print("Failed to obtain article content. Exiting.")
+        return
+
+    # Determine output filename for markdown
+    if args.output:
+        output_path = args.output
+    else:
+        output_path = default_report_path(article_data, reports_dir)
+
+    # In streaming mode, sections are written to the report and stdout as
+    # soon as the model has produced them
+    on_section = None
+    if args.stream and not args.offline:
+        on_section = ProgressiveReportWriter(article_data, output_path).add_section
+
+    analysis, credibility_info = run_analysis(
+        args.url,
+        article_data,
+        compare=args.compare,
+        max_related=args.max_related,
+        chunk_tokens=args.chunk_tokens,
+        combined=args.combined,
+        on_section=on_section,
+        offline=args.offline,
+        verbose=verbose,
+    )
+
     # If comparative analysis wasn't requested via arguments, ask the user if they want it now
-    if not args.compare and not args.html:
+    if not args.compare and not args.html and not args.offline:
         user_input = (
             input(
                 "Would you like to perform a comparative analysis with other articles on the same topic? (y/n): "
@@ -150,22 +971,13 @@ def main():
             .lower()
         )
         if user_input == "y" or user_input == "yes":
-            print("Finding related articles for comparison...")
-            related_articles = find_related_articles(article_data)
-            if related_articles:
-                print(
-                    f"Found {len(related_articles)} related articles. Comparing perspectives..."
-                )
-                comparative_info = compare_article_perspectives(
-                    article_data, related_articles
-                )
+            comparative_info = run_comparison(article_data, args.max_related)
+            if comparative_info:
                 analysis["comparative_analysis"] = comparative_info.get(
                     "perspective_analysis"
                 )
                 analysis["related_articles"] = comparative_info.get("related_articles")
                 print("Comparative analysis complete!")
-            else:
-                print("No related articles found for comparison.")
 
     # Ask about HTML report if not already requested
     if not args.html:
@@ -177,32 +989,20 @@ def main():
         if user_input == "y" or user_input == "yes":
             args.html = True
 
-    # Generate filename from article title
-    safe_title = "".join(c if c.isalnum() else "_" for c in article_data["title"][:50])
-
-    # Generate the markdown report
-    print("Generating report...")
-    report = generate_markdown_report(
-        article_data, analysis, credibility_info, verbose=verbose
+    # Save the markdown (and optionally HTML) report
+    write_reports(
+        article_data,
+        analysis,
+        credibility_info,
+        output_path,
+        html=args.html,
+        verbose=verbose,
     )
-
-    # Determine output filename for markdown
-    if args.output:
-        output_path = args.output
-    else:
-        output_path = os.path.join(reports_dir, f"{safe_title}.md")
-
-    # Save the markdown report
-    save_report(report, output_path)
     print(f"Analysis complete! Report saved to {output_path}")
-
-    # Generate HTML report if requested
-    if args.html:
-        html_path = os.path.splitext(output_path)[0] + ".html"
-        print("Generating interactive HTML report...")
-        html_report = generate_html_report(article_data, analysis, credibility_info)
-        save_html_report(html_report, html_path)
-        print(f"HTML report saved to {html_path}")
+    if get_cascade().enabled:
+        print_cascade_stats()
+    if verbose:
+        print_run_stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+import threading
+
+from .engine import MODELS, get_median_latency
+from .offline_analyzer import content_tone
+from ..utils.text_processor import split_into_chunks
+
+LOCAL = "local"
+REDUCED = "reduced"
+LLM = "llm"
+
+# Latency assumed for an LLM call before any real calls have been timed
+DEFAULT_CALL_SECONDS = 5.0
+
+
+def risk_score(article_data, headline_info, credibility_info):
+    """
+    Combine the cheap local signals into a risk score between 0 and 1.
+
+    0 means every signal looks like careful reporting (calm headline, named
+    author, date, citations, neutral tone); values near 1 mean clickbait
+    headlines, missing attribution and charged language.
+    """
+    risk = 0.5 * min(headline_info.get("sensationalism_score", 0), 100) / 100
+
+    if article_data.get("author") is None:
+        risk += 0.1
+    if article_data.get("date") is None:
+        risk += 0.05
+    citations = credibility_info.get("citation_count", 0)
+    if citations == 0:
+        risk += 0.15
+    elif citations > 3:
+        risk -= 0.1
+    if len(article_data.get("content") or "") < 1000:
+        risk += 0.05
+
+    tone = content_tone(article_data.get("content") or "")
+    if tone["label"] in ("emotional", "opinion-based"):
+        risk += 0.2
+    elif tone["label"] == "persuasive":
+        risk += 0.1
+
+    return max(0.0, min(risk, 1.0))
+
+
+class Cascade:
+    """
+    Decides which articles need the full LLM analysis.
+
+    Articles whose local risk score is at or below `clean_below` (clearly
+    clean) or at or above `junk_above` (clearly junk) are confidently
+    classified by the local signals alone. They are routed to `action`:
+    "local" skips the LLM calls and uses the offline analysis, "reduced"
+    sends one shorter prompt (the first `reduced_tokens` tokens of the
+    article, without the separate headline critique). Everything in between
+    gets the full LLM treatment.
+    """
+
+    def __init__(
+        self,
+        enabled=False,
+        clean_below=0.15,
+        junk_above=0.7,
+        action=LOCAL,
+        reduced_tokens=1500,
+    ):
+        if action not in (LOCAL, REDUCED):
+            raise ValueError(f"Unknown cascade action: {action}")
+        self.enabled = enabled
+        self.clean_below = clean_below
+        self.junk_above = junk_above
+        self.action = action
+        self.reduced_tokens = reduced_tokens
+        self.stats = {
+            "articles": 0,
+            "local": 0,
+            "reduced": 0,
+            "llm": 0,
+            "calls_skipped": 0,
+            "tokens_saved": 0,
+        }
+        self._lock = threading.Lock()
+
+    def route(self, article_data, headline_info, credibility_info):
+        """
+        Return the routing decision for an article.
+
+        Returns:
+            dict: "route" (local, reduced or llm), "verdict" (clean, junk or
+                inconclusive) and the "risk" score
+        """
+        risk = risk_score(article_data, headline_info, credibility_info)
+        if risk <= self.clean_below:
+            verdict = "clean"
+        elif risk >= self.junk_above:
+            verdict = "junk"
+        else:
+            verdict = "inconclusive"
+        route = LLM if verdict == "inconclusive" or not self.enabled else self.action
+        return {"route": route, "verdict": verdict, "risk": risk}
+
+    def reduce(self, article_data):
+        """Return a copy of the article cut to its first `reduced_tokens` tokens."""
+        chunks = split_into_chunks(
+            article_data.get("content") or "", self.reduced_tokens
+        )
+        return dict(article_data, content=chunks[0] if chunks else "")
+
+    def record(self, route, calls_skipped=0, tokens_saved=0):
+        """Count an article that was routed, and the LLM work it avoided."""
+        with self._lock:
+            self.stats["articles"] += 1
+            self.stats[route] += 1
+            self.stats["calls_skipped"] += calls_skipped
+            self.stats["tokens_saved"] += tokens_saved
+
+
+_cascade = Cascade()
+
+
+def configure_cascade(**options):
+    """
+    Replace the shared cascade.
+
+    Args:
+        **options: Any of enabled, clean_below, junk_above, action,
+            reduced_tokens
+    """
+    global _cascade
+    _cascade = Cascade(**options)
+
+
+def get_cascade():
+    """Return the process-wide Cascade."""
+    return _cascade
+
+
+def get_cascade_stats():
+    """
+    Return how many articles took each route and the API time saved.
+
+    The time saved is estimated from the median latency of the primary
+    model's calls in this run.
+    """
+    with _cascade._lock:
+        stats = dict(_cascade.stats)
+    median = get_median_latency(MODELS[0])
+    seconds_per_call = median if median is not None else DEFAULT_CALL_SECONDS
+    stats["local_fraction"] = (
+        stats["local"] / stats["articles"] if stats["articles"] else 0.0
+    )
+    stats["api_seconds_saved"] = stats["calls_skipped"] * seconds_per_call
+    return stats
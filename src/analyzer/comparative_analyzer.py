@@ -1,10 +1,14 @@
-import requests
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 from urllib.parse import quote
-from bs4 import BeautifulSoup
 from ..utils.article_fetcher import fetch_article_content
-from langchain_google_genai import ChatGoogleGenerativeAI
+from ..utils.http_client import http_get
+from .engine import AUXILIARY_MODEL, get_engine
+
+# Upper bound on related pages fetched at the same time (matches the HTTP
+# client's per-host connection pool)
+MAX_FETCH_WORKERS = 16
 
 
 def extract_search_terms(article_data):
@@ -44,16 +48,15 @@ def extract_search_terms(article_data):
 
 def find_related_articles(article_data, max_articles=3):
     """Find related articles on the same topic from different sources."""
+    from bs4 import BeautifulSoup
+
     search_terms = extract_search_terms(article_data)
     print(f"Searching for related articles about: {search_terms}")
 
     search_url = f"https://news.google.com/search?q={quote(search_terms)}&hl=en-US"
 
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(search_url, headers=headers)
+        response = http_get(search_url)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, "html.parser")
@@ -104,18 +107,44 @@ def find_related_articles(article_data, max_articles=3):
         return []
 
 
-def compare_article_perspectives(original_article, related_articles):
-    """Compare the perspectives between the original and related articles."""
+def fetch_related_contents(related_articles, max_workers=None, deadline=20.0):
+    """
+    Fetch related articles concurrently, dropping late or failing sources.
+
+    Args:
+        related_articles: List of dicts with "title", "url" and "source"
+        max_workers: Maximum number of pages fetched at the same time
+            (default: all of them, up to MAX_FETCH_WORKERS)
+        deadline: Overall time budget in seconds for all fetches
+
+    Returns:
+        list: Dicts with "title", "source" and a content excerpt, in input order
+    """
     if not related_articles:
-        return {
-            "perspective_analysis": "Unable to find related articles for comparison.",
-            "related_articles": [],
-        }
+        return []
+
+    if max_workers is None:
+        max_workers = MAX_FETCH_WORKERS
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(related_articles)))
+    )
+    futures = [
+        executor.submit(fetch_article_content, article["url"])
+        for article in related_articles
+    ]
+    done, not_done = wait(futures, timeout=deadline)
+    # Don't hold up the comparison for sources that missed the deadline
+    executor.shutdown(wait=False, cancel_futures=True)
+    if not_done:
+        print(
+            f"Dropping {len(not_done)} related article(s) that did not load within {deadline:.0f}s"
+        )
 
-    # Fetch content from related articles
     articles_with_content = []
-    for article in related_articles:
-        content = fetch_article_content(article["url"])
+    for article, future in zip(related_articles, futures):
+        if future not in done or future.exception() is not None:
+            continue
+        content = future.result()
         if content:
             articles_with_content.append(
                 {
@@ -126,6 +155,23 @@ def compare_article_perspectives(original_article, related_articles):
                     ],  # Limit to first 1000 chars
                 }
             )
+    return articles_with_content
+
+
+def compare_article_perspectives(
+    original_article, related_articles, max_workers=None, deadline=20.0
+):
+    """Compare the perspectives between the original and related articles."""
+    if not related_articles:
+        return {
+            "perspective_analysis": "Unable to find related articles for comparison.",
+            "related_articles": [],
+        }
+
+    # Fetch content from related articles
+    articles_with_content = fetch_related_contents(
+        related_articles, max_workers=max_workers, deadline=deadline
+    )
 
     if not articles_with_content:
         return {
@@ -141,8 +187,6 @@ def compare_article_perspectives(original_article, related_articles):
             "related_articles": related_articles,
         }
 
-    llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.2)
-
     # Create comparison prompt
     prompt = f"""
     I'm going to provide you with an original article and {len(articles_with_content)} related articles on the same topic.
@@ -166,10 +210,7 @@ def compare_article_perspectives(original_article, related_articles):
     """
 
     try:
-        result = llm.invoke(prompt)
-        perspective_analysis = (
-            result.content if hasattr(result, "content") else str(result)
-        )
+        perspective_analysis = get_engine().invoke(AUXILIARY_MODEL, prompt)
     except Exception as e:
         perspective_analysis = f"Error performing comparative analysis: {str(e)}"
 
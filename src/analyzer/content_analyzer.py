@@ -1,142 +1,306 @@
-import os
-import time
-import random
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import StructuredOutputParser, ResponseSchema
-from ..utils.text_processor import extract_section
-
-
-def analyze_article(article_data, verbose=False):
-    """Use LLM to analyze the article content."""
-
-    # Define output schemas
-    response_schemas = [
-        ResponseSchema(
-            name="core_claims",
-            description="A bulleted list summarizing the 3-5 main factual claims the article makes.",
-        ),
-        ResponseSchema(
-            name="language_tone",
-            description="A brief analysis and classification of the article's language (e.g., neutral, emotional, persuasive, opinion-based).",
-        ),
-        ResponseSchema(
-            name="red_flags",
-            description="A bulleted list identifying any detected signs of bias or poor reporting.",
-        ),
-        ResponseSchema(
-            name="verification_questions",
-            description="A list of 3-4 insightful, specific questions a reader should ask to independently verify the article's content.",
-        ),
-        ResponseSchema(
-            name="key_entities",
-            description="A list of key people, organizations, and locations mentioned in the article, each with a suggestion of what to investigate about them.",
-        ),
-        ResponseSchema(
-            name="counter_argument",
-            description="A brief summary of the article from a hypothetical opposing viewpoint to highlight potential biases.",
-        ),
-    ]
-
-    output_parser = StructuredOutputParser.from_response_schemas(response_schemas)
-    format_instructions = output_parser.get_format_instructions()
-
-    template = """
-    You are the "Digital Skeptic" AI, a critical thinking assistant. Your job is to analyze news articles 
-    and provide a critical analysis without determining what is "true" or "false."
-    
-    Article Title: {title}
-    
-    Article Content: {content}
-    
-    Please provide a critical analysis of this article with the following components:
-    
-    1. Core Claims: Identify the 3-5 main factual claims the article makes.
-    2. Language & Tone Analysis: Analyze the article's language style and tone.
-    3. Potential Red Flags: Identify any signs of bias or poor reporting practices.
-    4. Verification Questions: Provide 3-4 specific questions readers should ask to verify the content.
-    5. Key Entities Analysis: Identify key people, organizations, and locations mentioned in the article and suggest what readers should investigate about each (e.g., "Investigate the author's previous work," "Look into the funding of the institute").
-    6. Counter-Argument Simulation: Briefly summarize the article from a hypothetical opposing viewpoint to highlight its potential biases.
-    
-    {format_instructions}
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.text_processor import (
+    StreamingSectionParser,
+    estimate_tokens,
+    extract_section,
+    parse_sections,
+    repair_json,
+    split_into_chunks,
+)
+from .engine import get_engine, require_api_key
+from .offline_analyzer import analyze_offline
+
+# Articles longer than this many (estimated) tokens are analyzed map-reduce style
+DEFAULT_CHUNK_TOKENS = 8000
+
+
+def analyze_article(
+    article_data,
+    verbose=False,
+    chunk_tokens=DEFAULT_CHUNK_TOKENS,
+    include_headline=False,
+):
     """
+    Use LLM to analyze the article content.
 
-    prompt = PromptTemplate(
-        input_variables=["title", "content"],
-        partial_variables={"format_instructions": format_instructions},
-        template=template,
-    )
+    Args:
+        article_data: Dictionary containing article information
+        verbose: Print detailed debug information
+        chunk_tokens: Articles longer than this many estimated tokens are split
+            into paragraph-aligned chunks that are analyzed concurrently and
+            merged by a final call. 0 or None always uses a single call.
+        include_headline: Also ask for the headline critique in the same
+            request; the result then has a "headline_analysis" key.
+
+    Returns:
+        dict: A dictionary containing the structured analysis components
+    """
 
     # Initialize the language model with API key
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "GOOGLE_API_KEY environment variable is not set. Please set it in your .env file or environment."
+    require_api_key()
+    engine = get_engine()
+
+    if chunk_tokens and estimate_tokens(article_data["content"]) > chunk_tokens:
+        return analyze_long_article(
+            article_data, chunk_tokens, verbose, include_headline=include_headline
         )
 
-    # Try with different models in case of rate limiting
-    models = ["gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.0-flash"]
+    output_parser, prompt, _ = engine.article_prompts(include_headline)
+    formatted_prompt = prompt.format(
+        title=article_data["title"], content=article_data["content"]
+    )
+    parse = partial(parse_structured, output_parser)
     result = None
+    if engine.hedging["enabled"]:
+        result = engine.invoke_hedged(formatted_prompt, parse=parse, verbose=verbose)
+    if not result:
+        result = engine.invoke_with_fallback(
+            formatted_prompt, verbose=verbose, parse=parse
+        )
 
-    for model in models:
-        try:
-            if verbose:
-                print(f"Trying with model: {model}")
-            else:
-                print(f"Analyzing with {model}...")
-
-            llm = ChatGoogleGenerativeAI(model=model, temperature=0.2)
-
-            # Implement retry with exponential backoff
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    formatted_prompt = prompt.format(
-                        title=article_data["title"], content=article_data["content"]
-                    )
-                    result = llm.invoke(formatted_prompt)
-                    break  # If successful, break the retry loop
-                except Exception as e:
-                    if "quota" in str(e).lower() or "429" in str(e):
-                        if attempt < max_retries - 1:
-                            wait_time = (2**attempt) + random.uniform(0, 1)
-                            print(
-                                f"Rate limit hit. Retrying in {wait_time:.1f} seconds..."
-                            )
-                            time.sleep(wait_time)
-                        else:
-                            print(
-                                f"Max retries reached with model {model}. Trying another model if available."
-                            )
-                            raise
-                    else:
-                        # Not a rate limit error, re-raise
-                        raise
-
-            if result:  # If we got a result, no need to try other models
-                break
+    return parse_analysis(output_parser, result, article_data)
 
-        except Exception as e:
-            print(f"Error with model {model}: {str(e)}")
-            # Continue to try the next model
-            continue
 
+def parse_structured(output_parser, result):
+    """
+    Parse a structured response, repairing almost-valid JSON if needed.
+
+    Raises:
+        Exception: The parser's error if the response cannot be repaired
+            into an object with every expected field
+    """
+    try:
+        return output_parser.parse(result)
+    except Exception:
+        repaired = repair_json(result)
+        expected = [schema.name for schema in output_parser.response_schemas]
+        if repaired is None or any(key not in repaired for key in expected):
+            raise
+        return repaired
+
+
+def parse_analysis(output_parser, result, article_data):
+    """Parse an analysis response, falling back when it is missing or malformed."""
     # If we have a result, try to parse it
     if result:
         try:
-            return output_parser.parse(result.content)
+            return parse_structured(output_parser, result)
         except Exception as e:
             print(f"Error parsing structured output: {e}")
             # Fall back to manual extraction
-            return create_fallback_analysis(
-                result.content if hasattr(result, "content") else None
-            )
+            return create_fallback_analysis(result)
     else:
         # If all models failed, generate a fallback analysis based on simple heuristics
         print("All models failed. Generating fallback analysis...")
         return generate_fallback_analysis(article_data)
 
 
+def analyze_article_stream(
+    article_data,
+    on_section,
+    verbose=False,
+    chunk_tokens=DEFAULT_CHUNK_TOKENS,
+    include_headline=False,
+):
+    """
+    Analyze the article while streaming the response.
+
+    `on_section(key, value)` is called for each analysis component as soon
+    as it is complete in the stream, so callers can show results before the
+    whole response has arrived. Components that only become available at
+    the end (after a fallback, or for long articles analyzed in chunks) are
+    reported then. Each component is reported once.
+
+    Returns:
+        dict: The full analysis, as returned by analyze_article
+    """
+    require_api_key()
+    engine = get_engine()
+    emitted = set()
+
+    if not chunk_tokens or estimate_tokens(article_data["content"]) <= chunk_tokens:
+        output_parser, prompt, _ = engine.article_prompts(include_headline)
+        formatted_prompt = prompt.format(
+            title=article_data["title"], content=article_data["content"]
+        )
+        parse = partial(parse_structured, output_parser)
+        section_parser = StreamingSectionParser()
+        parts = []
+        try:
+            for text in engine.stream_with_fallback(
+                formatted_prompt, verbose=verbose, parse=parse
+            ):
+                parts.append(text)
+                for key, value in section_parser.feed(text):
+                    if key not in emitted:
+                        emitted.add(key)
+                        on_section(key, value)
+        except Exception as e:
+            print(f"Streaming interrupted ({e}); retrying without streaming...")
+            parts = []
+
+        result = "".join(parts) or engine.invoke_with_fallback(
+            formatted_prompt, verbose=verbose, parse=parse
+        )
+        analysis = parse_analysis(output_parser, result, article_data)
+    else:
+        analysis = analyze_article(
+            article_data, verbose, chunk_tokens, include_headline=include_headline
+        )
+
+    for key, value in analysis.items():
+        if key not in emitted and value:
+            on_section(key, value)
+    return analysis
+
+
+def analyze_article_batch(
+    articles,
+    verbose=False,
+    chunk_tokens=DEFAULT_CHUNK_TOKENS,
+    include_headline=False,
+    batch_size=8,
+    max_concurrency=4,
+):
+    """
+    Analyze many articles, sending their prompts through the LLM batch API.
+
+    Articles longer than `chunk_tokens` still go through the map-reduce path
+    one by one. Each article that gets no usable response falls back to
+    generate_fallback_analysis, so one bad article never fails the batch.
+
+    Args:
+        articles: List of article_data dictionaries
+        verbose: Print detailed debug information
+        chunk_tokens: See analyze_article
+        include_headline: See analyze_article
+        batch_size: Prompts per batch call
+        max_concurrency: Concurrent requests within a batch call
+
+    Returns:
+        list: One analysis dictionary per article, in input order
+    """
+    if not articles:
+        return []
+    require_api_key()
+    engine = get_engine()
+    output_parser, prompt, _ = engine.article_prompts(include_headline)
+
+    analyses = [None] * len(articles)
+    batched = []  # (index, formatted prompt)
+    for index, article_data in enumerate(articles):
+        try:
+            content = article_data["content"]
+            if chunk_tokens and estimate_tokens(content) > chunk_tokens:
+                analyses[index] = analyze_long_article(
+                    article_data, chunk_tokens, verbose, include_headline
+                )
+            else:
+                batched.append(
+                    (index, prompt.format(title=article_data["title"], content=content))
+                )
+        except Exception as e:
+            print(f"Error preparing article {index + 1} for analysis: {e}")
+            analyses[index] = generate_fallback_analysis(article_data)
+
+    responses = engine.invoke_batch(
+        [formatted for _, formatted in batched],
+        batch_size=batch_size,
+        max_concurrency=max_concurrency,
+        verbose=verbose,
+        parse=partial(parse_structured, output_parser),
+    )
+    for (index, _), result in zip(batched, responses):
+        if not result:
+            print(
+                f"No response for article {index + 1}. Generating fallback analysis..."
+            )
+            analyses[index] = generate_fallback_analysis(articles[index])
+            continue
+        try:
+            analyses[index] = parse_structured(output_parser, result)
+        except Exception as e:
+            print(f"Error parsing structured output for article {index + 1}: {e}")
+            analyses[index] = create_fallback_analysis(result)
+
+    return analyses
+
+
+def analyze_long_article(
+    article_data, chunk_tokens, verbose=False, include_headline=False
+):
+    """
+    Map-reduce analysis for articles that are too long for one prompt.
+
+    Each paragraph-aligned chunk is analyzed concurrently for claims, red
+    flags and entities, then a final call merges the partial results into
+    the regular six-part analysis.
+    """
+    engine = get_engine()
+    output_parser, _, reduce_prompt = engine.article_prompts(include_headline)
+    chunks = split_into_chunks(article_data["content"], chunk_tokens)
+    print(f"Long article: analyzing {len(chunks)} chunks concurrently...")
+
+    def analyze_chunk(index_and_chunk):
+        index, chunk = index_and_chunk
+        result = engine.invoke_with_fallback(
+            engine.chunk_prompt.format(
+                index=index,
+                total=len(chunks),
+                title=article_data["title"],
+                content=chunk,
+            ),
+            verbose=verbose,
+            parse=partial(parse_structured, engine.chunk_parser),
+        )
+        if not result:
+            return None
+        try:
+            return parse_structured(engine.chunk_parser, result)
+        except Exception as e:
+            print(f"Error parsing chunk {index} analysis: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
+        partials = list(executor.map(analyze_chunk, enumerate(chunks, 1)))
+
+    findings = ""
+    for index, part in enumerate(partials, 1):
+        if not part:
+            continue
+        findings += f"\nPart {index}:\n"
+        for key in ("claims", "red_flags", "entities"):
+            value = part.get(key, [])
+            if isinstance(value, list):
+                value = "; ".join(str(item) for item in value)
+            findings += f"- {key.replace('_', ' ').title()}: {value}\n"
+
+    if not findings:
+        print("All chunk analyses failed. Generating fallback analysis...")
+        return generate_fallback_analysis(article_data)
+
+    result = engine.invoke_with_fallback(
+        reduce_prompt.format(
+            title=article_data["title"],
+            opening=chunks[0][:1000],
+            findings=findings,
+        ),
+        verbose=verbose,
+        parse=partial(parse_structured, output_parser),
+    )
+
+    if not result:
+        print("All models failed. Generating fallback analysis...")
+        return generate_fallback_analysis(article_data)
+
+    try:
+        return parse_structured(output_parser, result)
+    except Exception as e:
+        print(f"Error parsing structured output: {e}")
+        return create_fallback_analysis(result)
+
+
 def create_fallback_analysis(raw_content):
     """
     Create a structured analysis from raw LLM output when the parser fails.
@@ -150,15 +314,20 @@ def create_fallback_analysis(raw_content):
     if not raw_content:
         return generate_empty_analysis()
 
+    # Tokenize the response into sections once, then look each one up
+    sections = parse_sections(raw_content)
+
+    def section(name):
+        return extract_section(raw_content, name, sections)
+
     return {
-        "core_claims": extract_section(raw_content, "Core Claims"),
-        "language_tone": extract_section(raw_content, "Language & Tone Analysis"),
-        "red_flags": extract_section(raw_content, "Potential Red Flags"),
-        "verification_questions": extract_section(
-            raw_content, "Verification Questions"
-        ),
-        "key_entities": extract_section(raw_content, "Key Entities Analysis"),
-        "counter_argument": extract_section(raw_content, "Counter-Argument Simulation"),
+        "core_claims": section("Core Claims"),
+        "language_tone": section("Language & Tone Analysis"),
+        "red_flags": section("Potential Red Flags"),
+        "verification_questions": section("Verification Questions"),
+        "key_entities": section("Key Entities Analysis"),
+        "counter_argument": section("Counter-Argument Simulation"),
+        "headline_analysis": section("Headline Analysis") or None,
     }
 
 
@@ -166,47 +335,16 @@ def generate_fallback_analysis(article_data):
     """
     Generate a basic analysis when all LLM calls fail using simple heuristics.
 
+    The local engine in offline_analyzer extracts claims, entities, tone and
+    red flags from the text itself.
+
     Args:
         article_data: Dictionary containing article information
 
     Returns:
         dict: A dictionary containing the fallback analysis components
     """
-    title = article_data.get("title", "")
-    content = article_data.get("content", "")
-
-    # Extract potential entities (very basic approach)
-    entities = []
-    if content:
-        # Look for capitalized words that might be entities
-        words = content.split()
-        for i, word in enumerate(words):
-            if (
-                word[0].isupper()
-                and len(word) > 1
-                and (i == 0 or words[i - 1].endswith((".", "!", "?", '"', "'")))
-            ):
-                if word not in entities:
-                    entities.append(word)
-
-    # Create basic verification questions
-    questions = [
-        "What are the primary sources cited in this article?",
-        "Is there evidence presented to support the main claims?",
-        "What perspectives might be missing from this reporting?",
-    ]
-
-    return {
-        "core_claims": [f"The article discusses {title}"],
-        "language_tone": "Unable to analyze the tone due to technical limitations.",
-        "red_flags": ["Analysis unavailable - please read critically"],
-        "verification_questions": questions,
-        "key_entities": [
-            f"{entity} - Consider researching this entity's background"
-            for entity in entities[:5]
-        ],
-        "counter_argument": "Unable to generate a counter-argument due to technical limitations. Consider seeking alternative viewpoints on this topic.",
-    }
+    return analyze_offline(article_data)
 
 
 def generate_empty_analysis():
@@ -1,6 +1,54 @@
 import re
 from urllib.parse import urlparse
 
+from ..utils.domain_reputation import RATING_FACTORS, lookup_domain_reputation
+
+# Citation phrases and links by kind, matched against the lowercased content
+CITATION_KINDS = {
+    "according_to": r"according to (?=[a-z]{2})",
+    "cited": r"cited (?=[a-z]{2})",
+    "reported_by": r"reported by",
+    "study": r"study (?:by|from|in)",
+    "research": r"research (?:by|from|in)",
+    "sources": r"sources?:",
+}
+LINK_KINDS = {
+    "href": r"href",
+    "http": r"http",
+}
+SCAN_KINDS = {**CITATION_KINDS, **LINK_KINDS}
+
+# Plain-text kinds are counted with str.count and the others with one
+# findall each: on large documents this is about twice as fast as a single
+# alternation pass that classifies every match
+_LITERAL_KINDS = {
+    kind: pattern
+    for kind, pattern in SCAN_KINDS.items()
+    if not set(pattern) & set(".^$*+?{}[]()|\\")
+}
+_PATTERN_KINDS = {
+    kind: re.compile(pattern)
+    for kind, pattern in SCAN_KINDS.items()
+    if kind not in _LITERAL_KINDS
+}
+
+
+def scan_citations(content):
+    """
+    Count the citation phrases and links in an article.
+
+    Matching is case-insensitive, as "According to Reuters" and
+    "according to reuters" cite alike.
+
+    Returns:
+        dict: {kind: number of occurrences} for every citation and link kind
+    """
+    lowered = content.lower()
+    counts = {kind: lowered.count(text) for kind, text in _LITERAL_KINDS.items()}
+    for kind, pattern in _PATTERN_KINDS.items():
+        counts[kind] = len(pattern.findall(lowered))
+    return {kind: counts[kind] for kind in SCAN_KINDS}
+
 
 def analyze_source_credibility(url, article_data):
     """
@@ -15,30 +63,23 @@ def analyze_source_credibility(url, article_data):
     """
     domain = urlparse(url).netloc
 
+    content = article_data.get("content") or ""
+    counts = scan_citations(content)
+    citation_kinds = {kind: counts[kind] for kind in CITATION_KINDS}
+    # citation_count is the number of different kinds of citation found
+    # (so "cites multiple sources" means more than three kinds, as it always
+    # has); citation_kinds holds the occurrences of each kind
+    citation_count = sum(1 for count in citation_kinds.values() if count)
+
     # Simple indicators for analysis
     indicators = {
         "has_author": article_data.get("author") is not None,
         "has_date": article_data.get("date") is not None,
-        "has_internal_links": "href" in article_data.get("content", ""),
-        "has_external_links": "http" in article_data.get("content", ""),
-        "content_length": len(article_data.get("content", "")),
+        "has_internal_links": counts["href"] > 0,
+        "has_external_links": counts["http"] > 0,
+        "content_length": len(content),
     }
 
-    # Look for citation patterns
-    citation_patterns = [
-        r"according to [A-Z][a-z]+",
-        r"cited [A-Z][a-z]+",
-        r"reported by",
-        r"study (by|from|in)",
-        r"research (by|from|in)",
-        r"source[s]?:",
-    ]
-
-    content = article_data.get("content", "")
-    citation_count = sum(
-        1 for pattern in citation_patterns if re.search(pattern, content, re.IGNORECASE)
-    )
-
     # Simple credibility factors analysis
     credibility_factors = []
 
@@ -64,10 +105,21 @@ def analyze_source_credibility(url, article_data):
             "Article is very brief, which may limit comprehensive coverage"
         )
 
-    # Domain credibility could be expanded with a database of known news sources
+    # Domain reputation from the local list of known sources
+    reputation = lookup_domain_reputation(urlparse(url).hostname)
+    if reputation:
+        factor = RATING_FACTORS.get(
+            reputation["rating"], f"Source is rated '{reputation['rating']}'"
+        )
+        detail = reputation["description"] or reputation["domain"]
+        credibility_factors.append(f"{factor} ({detail})")
+    elif domain:
+        credibility_factors.append("Source domain is not in the list of known sources")
 
     return {
         "credibility_factors": credibility_factors,
         "citation_count": citation_count,
+        "citation_kinds": citation_kinds,
         "domain": domain,
+        "reputation": reputation,
     }
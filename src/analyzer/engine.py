@@ -0,0 +1,704 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from ..utils.llm_cache import cached_invoke, find_cached_response, store_response
+from ..utils.rate_limiter import get_rate_limiter
+from ..utils.circuit_breaker import get_circuit_breaker
+from ..utils.text_processor import estimate_tokens
+
+MODELS = ["gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.0-flash"]
+
+# Model used for the headline critique and the comparative analysis
+AUXILIARY_MODEL = "gemini-1.5-flash"
+
+
+def models_starting_with(model):
+    """Return MODELS reordered so that `model` is tried first."""
+    return [model] + [other for other in MODELS if other != model]
+
+
+# Response fields, as ResponseSchema keyword arguments. langchain is only
+# imported once the engine is created, which keeps startup fast.
+ARTICLE_SCHEMAS = [
+    dict(
+        name="core_claims",
+        description="A bulleted list summarizing the 3-5 main factual claims the article makes.",
+    ),
+    dict(
+        name="language_tone",
+        description="A brief analysis and classification of the article's language (e.g., neutral, emotional, persuasive, opinion-based).",
+    ),
+    dict(
+        name="red_flags",
+        description="A bulleted list identifying any detected signs of bias or poor reporting.",
+    ),
+    dict(
+        name="verification_questions",
+        description="A list of 3-4 insightful, specific questions a reader should ask to independently verify the article's content.",
+    ),
+    dict(
+        name="key_entities",
+        description="A list of key people, organizations, and locations mentioned in the article, each with a suggestion of what to investigate about them.",
+    ),
+    dict(
+        name="counter_argument",
+        description="A brief summary of the article from a hypothetical opposing viewpoint to highlight potential biases.",
+    ),
+]
+
+# Extra field requested when the headline critique is merged into the main analysis
+HEADLINE_SCHEMA = dict(
+    name="headline_analysis",
+    description="A concise critique of the headline: whether it is sensationalist or clickbaity, its language and framing, the expectations it sets, and a more neutral alternative.",
+)
+
+HEADLINE_COMPONENT = """
+    7. Headline Analysis: Assess whether the headline is sensationalist or clickbaity, analyze its language and framing and how it sets reader expectations, and suggest a more neutral version."""
+
+CHUNK_SCHEMAS = [
+    dict(
+        name="claims",
+        description="A bulleted list of the main factual claims made in this part.",
+    ),
+    dict(
+        name="red_flags",
+        description="A bulleted list of signs of bias or poor reporting in this part.",
+    ),
+    dict(
+        name="entities",
+        description="A list of key people, organizations, and locations mentioned in this part.",
+    ),
+]
+
+ARTICLE_TEMPLATE = """
+    You are the "Digital Skeptic" AI, a critical thinking assistant. Your job is to analyze news articles 
+    and provide a critical analysis without determining what is "true" or "false."
+    
+    Article Title: {title}
+    
+    Article Content: {content}
+    
+    Please provide a critical analysis of this article with the following components:
+    
+    1. Core Claims: Identify the 3-5 main factual claims the article makes.
+    2. Language & Tone Analysis: Analyze the article's language style and tone.
+    3. Potential Red Flags: Identify any signs of bias or poor reporting practices.
+    4. Verification Questions: Provide 3-4 specific questions readers should ask to verify the content.
+    5. Key Entities Analysis: Identify key people, organizations, and locations mentioned in the article and suggest what readers should investigate about each (e.g., "Investigate the author's previous work," "Look into the funding of the institute").
+    6. Counter-Argument Simulation: Briefly summarize the article from a hypothetical opposing viewpoint to highlight its potential biases.{extra_components}
+    
+    {format_instructions}
+    """
+
+CHUNK_TEMPLATE = """
+    You are the "Digital Skeptic" AI, a critical thinking assistant. Below is part {index} of {total}
+    of a news article. Analyze only this part.
+    
+    Article Title: {title}
+    
+    Article Excerpt: {content}
+    
+    Please identify:
+    
+    1. Claims: The main factual claims made in this part.
+    2. Red Flags: Any signs of bias or poor reporting practices in this part.
+    3. Entities: Key people, organizations, and locations mentioned in this part.
+    
+    {format_instructions}
+    """
+
+REDUCE_TEMPLATE = """
+    You are the "Digital Skeptic" AI, a critical thinking assistant. Your job is to analyze news articles 
+    and provide a critical analysis without determining what is "true" or "false."
+    
+    The article below was too long to analyze at once, so each part was analyzed separately.
+    Merge the partial findings into a single critical analysis of the whole article.
+    
+    Article Title: {title}
+    
+    Article Opening: {opening}
+    
+    Partial Findings:
+    {findings}
+    
+    Please provide a critical analysis of this article with the following components:
+    
+    1. Core Claims: Identify the 3-5 main factual claims the article makes.
+    2. Language & Tone Analysis: Analyze the article's language style and tone.
+    3. Potential Red Flags: Identify any signs of bias or poor reporting practices.
+    4. Verification Questions: Provide 3-4 specific questions readers should ask to verify the content.
+    5. Key Entities Analysis: Identify key people, organizations, and locations mentioned in the article and suggest what readers should investigate about each.
+    6. Counter-Argument Simulation: Briefly summarize the article from a hypothetical opposing viewpoint to highlight its potential biases.{extra_components}
+    
+    {format_instructions}
+    """
+
+HEADLINE_TEMPLATE = """
+            Analyze this news headline for sensationalism, clickbait tactics, and framing choices:
+            
+            "{title}"
+            
+            Please provide:
+            1. An objective assessment of whether the headline appears sensationalist or clickbaity
+            2. Analysis of specific language choices and framing
+            3. How the headline might set reader expectations
+            4. Suggestions for a more neutral version of the headline
+            
+            Keep your analysis concise but insightful.
+            """
+
+
+def _response_schemas(fields):
+    from langchain.output_parsers import ResponseSchema
+
+    return [ResponseSchema(**field) for field in fields]
+
+
+class LatencyTracker:
+    """Recent successful response times per model, for percentile queries."""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, model, seconds):
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = self._samples[model] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, model, percent, min_samples=5):
+        """Return the latency percentile for a model, or None without enough data."""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+
+class AnalyzerEngine:
+    """
+    Long-lived holder of the prompts, output parsers and LLM clients.
+
+    Prompts and parsers are built once when the engine is created, and one
+    client per (model, temperature) is created on first use and then shared
+    by every analyzer and thread in the process.
+    """
+
+    def __init__(self):
+        from langchain.prompts import PromptTemplate
+        from langchain.output_parsers import StructuredOutputParser
+
+        self.article_parser, self.article_prompt, self.reduce_prompt = (
+            self._build_article_prompts(ARTICLE_SCHEMAS, "")
+        )
+        # Variant that also asks for the headline critique in the same request
+        self.combined_parser, self.combined_prompt, self.combined_reduce_prompt = (
+            self._build_article_prompts(
+                ARTICLE_SCHEMAS + [HEADLINE_SCHEMA], HEADLINE_COMPONENT
+            )
+        )
+
+        self.chunk_parser = StructuredOutputParser.from_response_schemas(
+            _response_schemas(CHUNK_SCHEMAS)
+        )
+        self.chunk_prompt = PromptTemplate(
+            input_variables=["index", "total", "title", "content"],
+            partial_variables={
+                "format_instructions": self.chunk_parser.get_format_instructions()
+            },
+            template=CHUNK_TEMPLATE,
+        )
+        self.headline_prompt = PromptTemplate(
+            input_variables=["title"], template=HEADLINE_TEMPLATE
+        )
+
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
+        self.latencies = LatencyTracker()
+        self.hedging = {
+            "enabled": False,
+            "percentile": 95,  # hedge once the primary is slower than this
+            "default_delay": 8.0,  # seconds, until enough latencies are known
+            "min_delay": 1.0,
+        }
+        self.hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        self._hedge_lock = threading.Lock()
+        self._hedge_executor = None
+
+    @staticmethod
+    def _build_article_prompts(schemas, extra_components):
+        from langchain.prompts import PromptTemplate
+        from langchain.output_parsers import StructuredOutputParser
+
+        parser = StructuredOutputParser.from_response_schemas(
+            _response_schemas(schemas)
+        )
+        partials = {
+            "format_instructions": parser.get_format_instructions(),
+            "extra_components": extra_components,
+        }
+        prompt = PromptTemplate(
+            input_variables=["title", "content"],
+            partial_variables=partials,
+            template=ARTICLE_TEMPLATE,
+        )
+        reduce_prompt = PromptTemplate(
+            input_variables=["title", "opening", "findings"],
+            partial_variables=partials,
+            template=REDUCE_TEMPLATE,
+        )
+        return parser, prompt, reduce_prompt
+
+    def article_prompts(self, include_headline=False):
+        """
+        Return (parser, prompt, reduce prompt) for the main article analysis.
+
+        With include_headline, the response schema has an extra
+        "headline_analysis" field so one request covers both analyses.
+        """
+        if include_headline:
+            return (
+                self.combined_parser,
+                self.combined_prompt,
+                self.combined_reduce_prompt,
+            )
+        return self.article_parser, self.article_prompt, self.reduce_prompt
+
+    def get_llm(self, model, temperature=0.2):
+        """Return the shared client for a model, creating it on first use."""
+        key = (model, temperature)
+        client = self._clients.get(key)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(key)
+                if client is None:
+                    from langchain_google_genai import ChatGoogleGenerativeAI
+
+                    client = ChatGoogleGenerativeAI(
+                        model=model, temperature=temperature
+                    )
+                    self._clients[key] = client
+        return client
+
+    def _call_model(self, model, prompt, temperature):
+        # Every request to the API goes through the rate limiter and is timed
+        get_rate_limiter().acquire(model, estimate_tokens(prompt))
+        start = time.perf_counter()
+        result = self.get_llm(model, temperature).invoke(prompt)
+        self.latencies.record(model, time.perf_counter() - start)
+        return result.content if hasattr(result, "content") else str(result)
+
+    def invoke(self, model, prompt, temperature=0.2):
+        """
+        Send one prompt to one model (through the response cache).
+
+        Raises:
+            RuntimeError: If the model's circuit breaker is open
+        """
+
+        def send():
+            breaker = get_circuit_breaker()
+            if not breaker.allow(model):
+                raise RuntimeError(
+                    f"{model} is temporarily skipped after repeated failures"
+                )
+            try:
+                result = self._call_model(model, prompt, temperature)
+            except Exception:
+                breaker.record_failure(model)
+                raise
+            breaker.record_success(model)
+            return result
+
+        return cached_invoke(model, temperature, prompt, send)
+
+    def invoke_with_fallback(
+        self, formatted_prompt, verbose=False, temperature=0.2, parse=None
+    ):
+        """
+        Send a prompt to the first model in MODELS that answers.
+
+        Cached responses are reused. Models whose circuit breaker is open are
+        skipped. Requests wait for the shared rate limiter, and rate-limit
+        errors that still occur are retried with exponential backoff before
+        moving on to the next model. A response is only cached if `parse`
+        (an optional callable that raises on unusable responses) accepts it.
+
+        Returns:
+            str: The response text, or None if every model failed
+        """
+        model, result = find_cached_response(MODELS, temperature, formatted_prompt)
+        if result:
+            if verbose:
+                print(f"Using cached response from model: {model}")
+            return result
+
+        breaker = get_circuit_breaker()
+        for model in MODELS:
+            # Skip models that keep failing until their cooldown has passed
+            if not breaker.allow(model):
+                if verbose:
+                    print(
+                        f"Skipping model {model}: circuit open after repeated failures"
+                    )
+                continue
+
+            try:
+                if verbose:
+                    print(f"Trying with model: {model}")
+                else:
+                    print(f"Analyzing with {model}...")
+
+                # Implement retry with exponential backoff
+                max_retries = 3
+                for attempt in range(max_retries):
+                    try:
+                        result = self._call_model(model, formatted_prompt, temperature)
+                        break  # If successful, break the retry loop
+                    except Exception as e:
+                        if "quota" in str(e).lower() or "429" in str(e):
+                            if attempt < max_retries - 1:
+                                wait_time = (2**attempt) + random.uniform(0, 1)
+                                print(
+                                    f"Rate limit hit. Retrying in {wait_time:.1f} seconds..."
+                                )
+                                time.sleep(wait_time)
+                            else:
+                                print(
+                                    f"Max retries reached with model {model}. Trying another model if available."
+                                )
+                                raise
+                        else:
+                            # Not a rate limit error, re-raise
+                            raise
+
+                if result:  # If we got a result, no need to try other models
+                    breaker.record_success(model)
+                    _store_if_parsed(
+                        model, temperature, formatted_prompt, result, parse
+                    )
+                    break
+                breaker.record_failure(model)
+
+            except Exception as e:
+                breaker.record_failure(model)
+                print(f"Error with model {model}: {str(e)}")
+                # Continue to try the next model
+                continue
+
+        return result
+
+    def stream_with_fallback(
+        self, formatted_prompt, verbose=False, temperature=0.2, parse=None
+    ):
+        """
+        Yield the response to a prompt piece by piece as the model streams it.
+
+        A cached response is yielded in one piece. Otherwise the first model
+        in MODELS whose circuit breaker allows it streams the answer, which is
+        cached once complete if `parse` accepts it. A model that fails before
+        producing any output is replaced by the next one; a failure mid-stream
+        is raised.
+        """
+        model, cached = find_cached_response(MODELS, temperature, formatted_prompt)
+        if cached:
+            if verbose:
+                print(f"Using cached response from model: {model}")
+            yield cached
+            return
+
+        breaker = get_circuit_breaker()
+        for model in MODELS:
+            if not breaker.allow(model):
+                if verbose:
+                    print(
+                        f"Skipping model {model}: circuit open after repeated failures"
+                    )
+                continue
+
+            print(f"Streaming analysis from {model}...")
+            get_rate_limiter().acquire(model, estimate_tokens(formatted_prompt))
+            start = time.perf_counter()
+            parts = []
+            try:
+                for chunk in self.get_llm(model, temperature).stream(formatted_prompt):
+                    text = chunk.content if hasattr(chunk, "content") else str(chunk)
+                    if text:
+                        parts.append(text)
+                        yield text
+            except Exception as e:
+                breaker.record_failure(model)
+                if parts:
+                    raise
+                print(f"Error with model {model}: {str(e)}")
+                continue
+
+            if not parts:
+                breaker.record_failure(model)
+                continue
+            breaker.record_success(model)
+            self.latencies.record(model, time.perf_counter() - start)
+            _store_if_parsed(
+                model, temperature, formatted_prompt, "".join(parts), parse
+            )
+            return
+
+    def invoke_batch(
+        self,
+        prompts,
+        models=None,
+        batch_size=8,
+        max_concurrency=4,
+        temperature=0.2,
+        verbose=False,
+        parse=None,
+    ):
+        """
+        Send many prompts using the client's batch API.
+
+        Cached responses are reused. The remaining prompts are sent to the
+        first healthy model in groups of `batch_size`, with at most
+        `max_concurrency` requests in flight; prompts that fail are retried
+        as a batch on the next model. Responses are cached only if `parse`
+        accepts them.
+
+        Args:
+            prompts: Fully formatted prompts
+            models: Models in order of preference (default: MODELS)
+            batch_size: Prompts per batch call
+            max_concurrency: Concurrent requests within a batch call
+            temperature: Sampling temperature
+            verbose: Print detailed debug information
+            parse: Optional callable that raises if a response is unusable
+
+        Returns:
+            list: Response text per prompt, in input order (None where every
+                model failed)
+        """
+        results = [None] * len(prompts)
+        breaker = get_circuit_breaker()
+        limiter = get_rate_limiter()
+
+        pending = []
+        for index, prompt in enumerate(prompts):
+            _, results[index] = find_cached_response(
+                models or MODELS, temperature, prompt
+            )
+            if not results[index]:
+                pending.append(index)
+
+        for model in models or MODELS:
+            if not pending:
+                break
+            if not breaker.allow(model):
+                if verbose:
+                    print(
+                        f"Skipping model {model}: circuit open after repeated failures"
+                    )
+                continue
+
+            print(f"Analyzing {len(pending)} prompts with {model} in batches...")
+            llm = self.get_llm(model, temperature)
+            failed = []
+            for start in range(0, len(pending), max(1, batch_size)):
+                group = pending[start : start + max(1, batch_size)]
+                for index in group:
+                    limiter.acquire(model, estimate_tokens(prompts[index]))
+                try:
+                    responses = llm.batch(
+                        [prompts[index] for index in group],
+                        config={"max_concurrency": max_concurrency},
+                        return_exceptions=True,
+                    )
+                except Exception as e:
+                    responses = [e] * len(group)
+
+                for index, response in zip(group, responses):
+                    if isinstance(response, Exception):
+                        if verbose:
+                            print(f"Error with model {model}: {response}")
+                        failed.append(index)
+                        continue
+                    text = (
+                        response.content
+                        if hasattr(response, "content")
+                        else str(response)
+                    )
+                    results[index] = text
+                    _store_if_parsed(model, temperature, prompts[index], text, parse)
+
+            if len(failed) < len(pending):
+                breaker.record_success(model)
+            else:
+                breaker.record_failure(model)
+            pending = failed
+
+        return results
+
+    def hedge_delay(self, model):
+        """Seconds to wait for `model` before sending a duplicate request."""
+        delay = self.latencies.percentile(model, self.hedging["percentile"])
+        if delay is None:
+            delay = self.hedging["default_delay"]
+        return max(delay, self.hedging["min_delay"])
+
+    def invoke_hedged(
+        self, prompt, models=None, parse=None, temperature=0.2, verbose=False
+    ):
+        """
+        Send a prompt to the first healthy model and hedge slow responses.
+
+        If the primary model has not answered within hedge_delay(), the same
+        prompt is sent to the next healthy model in `models`. The first
+        response that `parse` accepts wins and the other request is cancelled
+        (or, if already running, its result is ignored). A failed request
+        also starts the next model straight away.
+
+        Args:
+            prompt: The fully formatted prompt
+            models: Models in order of preference (default: MODELS)
+            parse: Optional callable that raises if a response is unusable
+            temperature: Sampling temperature
+            verbose: Print detailed debug information
+
+        Returns:
+            str: The winning response text, or None if no model answered
+        """
+        models = models or MODELS
+        _, cached = find_cached_response(models[:2], temperature, prompt)
+        if cached:
+            return cached
+
+        breaker = get_circuit_breaker()
+
+        def attempt(model):
+            try:
+                text = self._call_model(model, prompt, temperature)
+            except Exception:
+                breaker.record_failure(model)
+                raise
+            breaker.record_success(model)
+            if parse:
+                parse(text)
+            store_response(model, temperature, prompt, text)
+            return text
+
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=16)
+            self.hedge_stats["requests"] += 1
+
+        remaining = iter(models)
+        pending = {}
+
+        def launch_next():
+            # Breakers are consulted lazily so half-open probes are only
+            # claimed for requests that are actually sent
+            for model in remaining:
+                if breaker.allow(model):
+                    if verbose:
+                        print(f"Sending request to model: {model}")
+                    pending[self._hedge_executor.submit(attempt, model)] = model
+                    return model
+            return None
+
+        primary = launch_next()
+        if primary is None:
+            return None
+
+        done, _ = wait(list(pending), timeout=self.hedge_delay(primary))
+        hedged = False
+        if not done:
+            hedged = launch_next() is not None
+            if hedged:
+                with self._hedge_lock:
+                    self.hedge_stats["hedged"] += 1
+                if verbose:
+                    print(
+                        f"{primary} is slow; hedging with {list(pending.values())[-1]}"
+                    )
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                model = pending.pop(future)
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    if hedged and model != primary:
+                        with self._hedge_lock:
+                            self.hedge_stats["hedge_wins"] += 1
+                    return future.result()
+                if verbose:
+                    print(f"Error with model {model}: {future.exception()}")
+                if not pending:
+                    launch_next()
+
+        return None
+
+
+def _store_if_parsed(model, temperature, prompt, text, parse):
+    """Cache a response unless `parse` rejects it, so it is not replayed."""
+    if parse:
+        try:
+            parse(text)
+        except Exception:
+            return
+    store_response(model, temperature, prompt, text)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide AnalyzerEngine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = AnalyzerEngine()
+    return _engine
+
+
+def configure_hedging(enabled=True, percentile=95, default_delay=8.0, min_delay=1.0):
+    """Turn hedged requests on or off for the shared engine."""
+    get_engine().hedging.update(
+        enabled=enabled,
+        percentile=percentile,
+        default_delay=default_delay,
+        min_delay=min_delay,
+    )
+
+
+def get_hedge_stats():
+    """Return how many requests were hedged and how often the hedge won."""
+    engine = _engine
+    if engine is None:
+        return {"requests": 0, "hedged": 0, "hedge_wins": 0}
+    with engine._hedge_lock:
+        return dict(engine.hedge_stats)
+
+
+def get_median_latency(model):
+    """Return the median response time of `model` in this run, or None if unknown."""
+    engine = _engine
+    if engine is None:
+        return None
+    return engine.latencies.percentile(model, 50, min_samples=1)
+
+
+def require_api_key():
+    """Raise ValueError if no Google API key is configured."""
+    if not os.environ.get("GOOGLE_API_KEY"):
+        raise ValueError(
+            "GOOGLE_API_KEY environment variable is not set. Please set it in your .env file or environment."
+        )
@@ -1,156 +1,269 @@
 import re
-from langchain_google_genai import ChatGoogleGenerativeAI
 import os
+from .engine import AUXILIARY_MODEL, get_engine, models_starting_with
+from .headline_model import get_headline_classifier
 
+CLICKBAIT_PHRASES = [
+    "you won't believe",
+    "shocking",
+    "mind blowing",
+    "amazing",
+    "jaw-dropping",
+    "unbelievable",
+    "incredible",
+    "insane",
+    "stunning",
+    "never seen before",
+    "secret",
+    "hack",
+    "trick",
+    "they don't want you to know",
+    "this one trick",
+    "miracle",
+    "breakthrough",
+    "life changing",
+    "game changing",
+    "must see",
+    "warning",
+    "attention",
+]
 
-def analyze_headline(article_data, verbose=False):
-    """Analyze the headline for sensationalism, clickbait, and framing."""
+EMOTIONAL_WORDS = [
+    "shocking",
+    "explosive",
+    "incredible",
+    "devastating",
+    "terrifying",
+    "catastrophic",
+    "horrifying",
+    "amazing",
+    "unbelievable",
+    "extraordinary",
+    "outrageous",
+    "sensational",
+    "scandalous",
+    "bombshell",
+    "staggering",
+    "dramatic",
+    "alarming",
+    "jaw-dropping",
+]
 
-    title = article_data.get("title", "")
-    if not title:
-        return {
-            "headline_analysis": "No headline available for analysis",
-            "sensationalism_score": 0,
-            "clickbait_indicators": [],
-        }
+SUPERLATIVES = [
+    "best",
+    "worst",
+    "most",
+    "biggest",
+    "greatest",
+    "easiest",
+    "deadliest",
+    "highest",
+    "lowest",
+]
 
-    # Simple rule-based analysis
-    clickbait_phrases = [
-        "you won't believe",
-        "shocking",
-        "mind blowing",
-        "amazing",
-        "jaw-dropping",
-        "unbelievable",
-        "incredible",
-        "insane",
-        "stunning",
-        "never seen before",
-        "secret",
-        "hack",
-        "trick",
-        "they don't want you to know",
-        "this one trick",
-        "miracle",
-        "breakthrough",
-        "life changing",
-        "game changing",
-        "must see",
-        "warning",
-        "attention",
-    ]
+# Morbid/shocking terminology ("serial killer" type content); the terms
+# cover their inflections ("killings", "murdering", "deadly")
+MORBID_TERMS = [
+    r"serial killers?",
+    r"murder\w*",
+    r"kill(?:s|ed|er|ers|ing|ings)?",
+    r"dead(?:ly)?",
+    r"deaths?",
+]
 
-    emotional_words = [
-        "shocking",
-        "explosive",
-        "incredible",
-        "devastating",
-        "terrifying",
-        "catastrophic",
-        "horrifying",
-        "amazing",
-        "unbelievable",
-        "extraordinary",
-        "outrageous",
-        "sensational",
-        "scandalous",
-        "bombshell",
-        "staggering",
-        "dramatic",
-        "alarming",
-        "jaw-dropping",
-    ]
+NEWS_TERMS = ["news", "breaking", "report", "reports", "exclusive"]
 
-    question_pattern = (
-        r"\?$|^(who|what|when|where|why|how|is|are|can|will|should|would|could|do|does)"
-    )
-    number_pattern = r"^\d+|^\d+ "  # Headlines starting with numbers
-    superlative_pattern = (
-        r"(best|worst|most|biggest|greatest|easiest|deadliest|highest|lowest)"
-    )
+# "Mom" is often used in clickbait to create relatability
+MOM_TERMS = ["mom", "moms"]
 
-    # Calculate simple scores
-    clickbait_count = sum(
-        1 for phrase in clickbait_phrases if phrase.lower() in title.lower()
-    )
-    emotional_count = sum(
-        1 for word in emotional_words if word.lower() in title.lower().split()
+# Lexicon terms are regular expressions matched against the lowercased
+# title, on word boundaries
+LEXICONS = {
+    "clickbait": CLICKBAIT_PHRASES,
+    "emotional": EMOTIONAL_WORDS,
+    "superlative": SUPERLATIVES,
+    "morbid": MORBID_TERMS,
+    "news": NEWS_TERMS,
+    "mom": MOM_TERMS,
+}
+
+QUESTION_PATTERN = re.compile(
+    r"\?$|^(?:who|what|when|where|why|how|is|are|can|will|should|would|could|do|does)\b",
+    re.IGNORECASE,
+)
+NUMBER_PATTERN = re.compile(r"^\d+")  # Headlines starting with numbers
+
+
+def _compile_lexicons(lexicons):
+    """
+    Build one word-bounded alternation regex for every lexicon term.
+
+    Longer terms are tried first, so a phrase wins over the words inside it.
+
+    Returns:
+        tuple: (compiled regex, [(category, term, compiled term regex), ...])
+    """
+    terms = sorted(
+        {term for words in lexicons.values() for term in words}, key=len, reverse=True
     )
-    has_question = bool(re.search(question_pattern, title.lower(), re.IGNORECASE))
-    has_number = bool(re.search(number_pattern, title))
-    has_superlative = bool(re.search(superlative_pattern, title.lower()))
+    bounded = r"(?<![\w'-])(?:{})(?![\w'-])"
+    pattern = re.compile(bounded.format("|".join(terms)))
+    entries = [
+        (category, term, re.compile(bounded.format(term)))
+        for category, words in lexicons.items()
+        for term in words
+    ]
+    return pattern, entries
+
+
+LEXICON_PATTERN, LEXICON_ENTRIES = _compile_lexicons(LEXICONS)
+
+# Matched text -> the (category, term) pairs it counts for, filled on first
+# sight of each text
+_hits_of_text = {}
+
+
+def lexicon_hits(text):
+    """
+    Return the lexicon terms a match of LEXICON_PATTERN counts for.
+
+    A match counts for every term it contains (itself included), so
+    "this one trick" also counts "trick".
+
+    Returns:
+        list: (category, term) pairs in lexicon order
+    """
+    hits = _hits_of_text.get(text)
+    if hits is None:
+        hits = [
+            (category, term)
+            for category, term, pattern in LEXICON_ENTRIES
+            if pattern.search(text)
+        ]
+        _hits_of_text[text] = hits
+    return hits
+
+
+# Points per signal in the sensationalism score; clickbait phrases and
+# emotional words score per distinct term, up to MAX_COUNTED_TERMS each
+SCORE_WEIGHTS = {
+    "clickbait": 20,
+    "emotional": 15,
+    "question": 10,
+    "number": 10,
+    "superlative": 15,
+    "news": 5,
+    "long": 5,
+    "all_caps": 5,
+    "morbid": 25,
+    "mom": 15,
+}
+MAX_COUNTED_TERMS = 3
+MAX_SCORE = 100
+
+# Titles longer than this score as "long"
+LONG_TITLE = 70
+
+LLM_NOT_REQUESTED = "LLM critique not requested; see the rule-based assessment below."
+
+
+def match_lexicons(title):
+    """
+    Find every lexicon term in a headline in one pass.
+
+    Returns:
+        dict: {category: [matched terms in lexicon order]} for each category
+    """
+    found = {category: set() for category in LEXICONS}
+    for match in LEXICON_PATTERN.finditer(title.lower()):
+        for category, term in lexicon_hits(match.group()):
+            found[category].add(term)
+    return {
+        category: [term for term in LEXICONS[category] if term in found[category]]
+        for category in LEXICONS
+    }
+
+
+def has_all_caps_word(title):
+    """Return True if any word of the title is in capitals (3+ letters)."""
+    return any(word.isupper() and len(word) > 2 for word in title.split())
+
+
+def score_headline(title):
+    """
+    Compute the rule-based sensationalism score of a headline.
+
+    Returns:
+        dict: "sensationalism_score" (0-100), "clickbait_indicators" and
+            the underlying "matches" and flags
+    """
+    matches = match_lexicons(title)
+    clickbait_count = len(matches["clickbait"])
+    emotional_count = len(matches["emotional"])
+    has_question = bool(QUESTION_PATTERN.search(title))
+    has_number = bool(NUMBER_PATTERN.search(title))
+    has_superlative = bool(matches["superlative"])
+    has_morbid = bool(matches["morbid"])
+    has_mom = bool(matches["mom"])
 
     # Create a simple score (0-100)
     base_score = 0
-    if clickbait_count > 0:
-        base_score += 20 * min(clickbait_count, 3)
-    if emotional_count > 0:
-        base_score += 15 * min(emotional_count, 3)
+    base_score += SCORE_WEIGHTS["clickbait"] * min(clickbait_count, MAX_COUNTED_TERMS)
+    base_score += SCORE_WEIGHTS["emotional"] * min(emotional_count, MAX_COUNTED_TERMS)
     if has_question:
-        base_score += 10
+        base_score += SCORE_WEIGHTS["question"]
     if has_number:
-        base_score += 10
+        base_score += SCORE_WEIGHTS["number"]
     if has_superlative:
-        base_score += 15
+        base_score += SCORE_WEIGHTS["superlative"]
 
     # Add a small base score for any headline from news sources
-    if "news" in title.lower() or any(
-        word in title.lower() for word in ["breaking", "report", "exclusive"]
-    ):
-        base_score += 5
+    if matches["news"]:
+        base_score += SCORE_WEIGHTS["news"]
 
     # Check title length - longer titles tend to be more sensationalist
-    if len(title) > 70:
-        base_score += 5
+    if len(title) > LONG_TITLE:
+        base_score += SCORE_WEIGHTS["long"]
 
     # Check for all caps segments which can indicate sensationalism
-    if any(word.isupper() and len(word) > 2 for word in title.split()):
-        base_score += 5
+    if has_all_caps_word(title):
+        base_score += SCORE_WEIGHTS["all_caps"]
 
     # Add some score for "serial killer" type content - clearly sensational
-    if any(
-        term in title.lower()
-        for term in ["serial killer", "murder", "kill", "dead", "death"]
-    ):
-        base_score += 25
+    if has_morbid:
+        base_score += SCORE_WEIGHTS["morbid"]
 
     # Add score for specific clickbaity content that isn't caught by above patterns
-    if (
-        "mom" in title.lower() and not "moment" in title.lower()
-    ):  # "Mom" is often used in clickbait
-        base_score += 15
-
-    # Cap at 100
-    sensationalism_score = min(base_score, 100)
+    if has_mom:
+        base_score += SCORE_WEIGHTS["mom"]
 
-    # Force to integer type
-    sensationalism_score = int(sensationalism_score)
+    return {
+        "sensationalism_score": int(min(base_score, MAX_SCORE)),
+        "clickbait_indicators": _clickbait_indicators(
+            matches["clickbait"],
+            matches["emotional"],
+            has_question,
+            has_number,
+            has_superlative,
+            has_mom,
+            has_morbid,
+        ),
+        "matches": matches,
+        "has_question": has_question,
+        "has_number": has_number,
+        "has_superlative": has_superlative,
+    }
 
-    # Debug information - only print in verbose mode
-    if verbose:
-        print(f"Title: {title}")
-        print(f"Calculated sensationalism score: {sensationalism_score}")
-        print(f"Clickbait count: {clickbait_count}, Emotional count: {emotional_count}")
-        print(
-            f"Has question: {has_question}, Has number: {has_number}, Has superlative: {has_superlative}"
-        )
 
-    # Collect detected patterns
+def _clickbait_indicators(
+    clickbait, emotional, has_question, has_number, has_superlative, has_mom, has_morbid
+):
+    """Describe the detected patterns of a headline."""
     clickbait_indicators = []
-    if clickbait_count > 0:
-        detected_phrases = [
-            phrase for phrase in clickbait_phrases if phrase.lower() in title.lower()
-        ]
-        clickbait_indicators.append(
-            f"Uses clickbait phrases: {', '.join(detected_phrases)}"
-        )
-    if emotional_count > 0:
-        detected_words = [
-            word for word in emotional_words if word.lower() in title.lower().split()
-        ]
-        clickbait_indicators.append(
-            f"Uses emotional language: {', '.join(detected_words)}"
-        )
+    if clickbait:
+        clickbait_indicators.append(f"Uses clickbait phrases: {', '.join(clickbait)}")
+    if emotional:
+        clickbait_indicators.append(f"Uses emotional language: {', '.join(emotional)}")
     if has_question:
         clickbait_indicators.append(
             "Headline poses a question (often used to create curiosity)"
@@ -161,44 +274,152 @@ def analyze_headline(article_data, verbose=False):
         )
     if has_superlative:
         clickbait_indicators.append("Uses superlatives like 'best', 'worst', 'most'")
-
-    # Add indicator for "mom" and "serial killer" content
-    if "mom" in title.lower() and not "moment" in title.lower():
+    if has_mom:
         clickbait_indicators.append(
             "Uses 'mom' in headline (common clickbait approach to create relatability)"
         )
-    if any(
-        term in title.lower()
-        for term in ["serial killer", "murder", "kill", "dead", "death"]
-    ):
+    if has_morbid:
         clickbait_indicators.append(
             "Uses morbid/shocking terminology (e.g., 'serial killer', 'murder') to grab attention"
         )
+    return clickbait_indicators
+
+
+def headline_features(titles):
+    """
+    Compute the scoring features of many headlines as NumPy arrays.
+
+    The lowercased titles are joined with newlines so the lexicon regex
+    scans the whole batch once; every match is mapped back to its title by
+    its offset.
+
+    Returns:
+        tuple: ({feature: array with one value per title}, {title index:
+            {category: [matched terms in lexicon order]}}); the features are
+            the term counts of each lexicon category plus the "question",
+            "number", "long" and "all_caps" flags
+    """
+    import numpy as np
+
+    titles = [title or "" for title in titles]
+    lowered = [title.lower() for title in titles]
+    count = len(titles)
+    lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=count)
+    starts = np.cumsum(lengths + 1) - (lengths + 1)
+
+    entries = [(category, term) for category, term, _ in LEXICON_ENTRIES]
+    entry_index = {entry: index for index, entry in enumerate(entries)}
+    positions, hits = [], []
+    for match in LEXICON_PATTERN.finditer("\n".join(lowered)):
+        for hit in lexicon_hits(match.group()):
+            positions.append(match.start())
+            hits.append(entry_index[hit])
+
+    # Distinct (title, term) pairs, sorted by title and then lexicon order
+    owners = np.searchsorted(starts, np.array(positions, dtype=np.int64), "right") - 1
+    pairs = np.unique(owners * len(entries) + np.array(hits, dtype=np.int64))
+    owners, hits = np.divmod(pairs, len(entries))
+
+    categories = list(LEXICONS)
+    entry_category = np.array(
+        [categories.index(category) for category, _ in entries], dtype=np.int64
+    )
+    counts = np.zeros((len(categories), count), dtype=np.int64)
+    np.add.at(counts, (entry_category[hits], owners), 1)
+
+    matches = {}
+    for owner, hit in zip(owners.tolist(), hits.tolist()):
+        category, term = entries[hit]
+        matches.setdefault(owner, {}).setdefault(category, []).append(term)
+
+    features = {category: counts[i] for i, category in enumerate(categories)}
+    features["question"] = np.fromiter(
+        (bool(QUESTION_PATTERN.search(title)) for title in titles), bool, count
+    )
+    features["number"] = np.fromiter(
+        (bool(NUMBER_PATTERN.search(title)) for title in titles), bool, count
+    )
+    features["long"] = (
+        np.fromiter(map(len, titles), dtype=np.int64, count=count) > LONG_TITLE
+    )
+    features["all_caps"] = np.fromiter(map(has_all_caps_word, titles), bool, count)
+    return features, matches
+
+
+def score_headline_features(features):
+    """
+    Apply the sensationalism scoring weights to arrays of headline features.
+
+    Returns:
+        numpy.ndarray: One score (0-100) per headline
+    """
+    import numpy as np
+
+    scores = SCORE_WEIGHTS["clickbait"] * np.minimum(
+        features["clickbait"], MAX_COUNTED_TERMS
+    ) + SCORE_WEIGHTS["emotional"] * np.minimum(
+        features["emotional"], MAX_COUNTED_TERMS
+    )
+    for flag in SCORE_WEIGHTS.keys() - {"clickbait", "emotional"}:
+        scores += SCORE_WEIGHTS[flag] * (features[flag] > 0)
+    return np.minimum(scores, MAX_SCORE)
+
+
+def analyze_headline(article_data, verbose=False, use_llm=True):
+    """
+    Analyze the headline for sensationalism, clickbait, and framing.
+
+    The sensationalism score and clickbait indicators are always computed
+    locally. With use_llm=False no LLM critique is requested (e.g. when it is
+    part of the main analysis request instead); a configured local headline
+    classifier writes the critique either way.
+    """
+
+    title = article_data.get("title", "")
+    if not title:
+        return {
+            "headline_analysis": "No headline available for analysis",
+            "sensationalism_score": 0,
+            "clickbait_indicators": [],
+        }
+
+    scores = score_headline(title)
+    sensationalism_score = scores["sensationalism_score"]
+    clickbait_indicators = scores["clickbait_indicators"]
+
+    # Debug information - only print in verbose mode
+    if verbose:
+        print(f"Title: {title}")
+        print(f"Calculated sensationalism score: {sensationalism_score}")
+        print(
+            f"Clickbait count: {len(scores['matches']['clickbait'])}, "
+            f"Emotional count: {len(scores['matches']['emotional'])}"
+        )
+        print(
+            f"Has question: {scores['has_question']}, Has number: {scores['has_number']}, "
+            f"Has superlative: {scores['has_superlative']}"
+        )
 
     # Use LLM for deeper analysis if available
     headline_analysis = ""
     try:
         api_key = os.environ.get("GOOGLE_API_KEY")
-        if api_key:
-            llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.2)
-            prompt = f"""
-            Analyze this news headline for sensationalism, clickbait tactics, and framing choices:
-            
-            "{title}"
-            
-            Please provide:
-            1. An objective assessment of whether the headline appears sensationalist or clickbaity
-            2. Analysis of specific language choices and framing
-            3. How the headline might set reader expectations
-            4. Suggestions for a more neutral version of the headline
-            
-            Keep your analysis concise but insightful.
-            """
-
-            result = llm.invoke(prompt)
-            headline_analysis = (
-                result.content if hasattr(result, "content") else str(result)
-            )
+        classifier = get_headline_classifier()
+        if classifier:
+            headline_analysis = classifier.describe(classifier.predict(title))
+        elif not use_llm:
+            headline_analysis = LLM_NOT_REQUESTED
+        elif api_key:
+            engine = get_engine()
+            prompt = engine.headline_prompt.format(title=title)
+            if engine.hedging["enabled"]:
+                headline_analysis = engine.invoke_hedged(
+                    prompt,
+                    models=models_starting_with(AUXILIARY_MODEL),
+                    verbose=verbose,
+                )
+            if not headline_analysis:
+                headline_analysis = engine.invoke(AUXILIARY_MODEL, prompt)
         else:
             headline_analysis = "LLM analysis unavailable: API key not configured."
     except Exception as e:
@@ -213,3 +434,118 @@ def analyze_headline(article_data, verbose=False):
         "sensationalism_score": sensationalism_score,
         "clickbait_indicators": clickbait_indicators,
     }
+
+
+def analyze_headlines(
+    titles, verbose=False, use_llm=False, batch_size=8, max_concurrency=4
+):
+    """
+    Analyze many headlines at once.
+
+    The features of all titles are computed and scored as NumPy arrays;
+    the results are the same as analyze_headline gives for each title.
+    The critiques come from the local headline classifier if one is
+    configured; otherwise no LLM calls are made unless use_llm is True, in
+    which case they are requested through the LLM batch API.
+
+    Args:
+        titles: List of headline strings
+        verbose: Whether to print detailed progress of the LLM calls
+        use_llm: Whether to request an LLM critique of every headline
+        batch_size: Number of prompts per LLM batch call
+        max_concurrency: Maximum number of LLM requests in flight
+
+    Returns:
+        list: One headline analysis dictionary per title, in input order
+    """
+    features, matches = headline_features(titles)
+    scores = score_headline_features(features).tolist()
+    flags = {
+        flag: (features[flag] > 0).tolist()
+        for flag in ("question", "number", "superlative", "mom", "morbid")
+    }
+
+    results = []
+    for index, title in enumerate(titles):
+        if not title:
+            results.append(
+                {
+                    "headline_analysis": "No headline available for analysis",
+                    "sensationalism_score": 0,
+                    "clickbait_indicators": [],
+                }
+            )
+            continue
+        terms = matches.get(index, {})
+        results.append(
+            {
+                "headline_analysis": LLM_NOT_REQUESTED,
+                "sensationalism_score": scores[index],
+                "clickbait_indicators": _clickbait_indicators(
+                    terms.get("clickbait", []),
+                    terms.get("emotional", []),
+                    flags["question"][index],
+                    flags["number"][index],
+                    flags["superlative"][index],
+                    flags["mom"][index],
+                    flags["morbid"][index],
+                ),
+            }
+        )
+
+    titled = [index for index, title in enumerate(titles) if title]
+    classifier = get_headline_classifier()
+    if classifier and titled:
+        probabilities = classifier.predict_many([titles[index] for index in titled])
+        for index, row in zip(titled, probabilities.tolist()):
+            results[index]["headline_analysis"] = classifier.describe(
+                dict(zip(classifier.labels, row))
+            )
+    elif use_llm and titled:
+        _add_llm_critiques(
+            results, titles, titled, verbose, batch_size, max_concurrency
+        )
+    return results
+
+
+def _add_llm_critiques(results, titles, titled, verbose, batch_size, max_concurrency):
+    """Fill in "headline_analysis" for the titled results from the LLM."""
+    if not os.environ.get("GOOGLE_API_KEY"):
+        for index in titled:
+            results[index][
+                "headline_analysis"
+            ] = "LLM analysis unavailable: API key not configured."
+        return
+
+    try:
+        engine = get_engine()
+        critiques = engine.invoke_batch(
+            [engine.headline_prompt.format(title=titles[index]) for index in titled],
+            models=models_starting_with(AUXILIARY_MODEL),
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+            verbose=verbose,
+        )
+    except Exception as e:
+        critiques = [f"LLM analysis error: {str(e)}"] * len(titled)
+
+    for index, critique in zip(titled, critiques):
+        results[index]["headline_analysis"] = (
+            critique or "LLM analysis error: no model returned a critique"
+        )
+
+
+def analyze_headline_batch(articles, verbose=False, batch_size=8, max_concurrency=4):
+    """
+    Analyze the headlines of many articles, batching the LLM critiques.
+
+    Returns:
+        list: One headline analysis dictionary per article, in input order
+    """
+    return analyze_headlines(
+        [article_data.get("title", "") for article_data in articles],
+        verbose=verbose,
+        use_llm=True,
+        batch_size=batch_size,
+        max_concurrency=max_concurrency,
+    )
@@ -0,0 +1,353 @@
+import glob
+import json
+import math
+import os
+import re
+import zlib
+
+DEFAULT_MODEL_PATH = os.path.join(".cache", "headline_model.npy")
+
+# Categories predicted for a headline, with the phrases in an LLM headline
+# critique that mark it as positive (unless negated)
+LABEL_TERMS = {
+    "sensational": r"sensational\w*|alarmist|hyperbol\w*|overblown|exaggerat\w*",
+    "clickbait": r"click-?bait\w*|curiosity gap",
+    "emotional": r"emotionally charged|emotive|emotional (?:language|appeal|words?)|loaded (?:language|words?|terms?)|inflammatory",
+    "biased_framing": r"biased|one-sided|misleading|slanted|leading framing|framing (?:implies|suggests)",
+}
+LABELS = list(LABEL_TERMS)
+LABEL_PATTERNS = {
+    label: re.compile(r"\b(?:" + terms + r")", re.IGNORECASE)
+    for label, terms in LABEL_TERMS.items()
+}
+
+# A negation shortly before a label term ("not sensational", "avoids
+# clickbait", "free of loaded language")
+NEGATION = re.compile(
+    r"\b(?:not|no|isn't|isn’t|avoids?|avoiding|without|lacks?|free (?:of|from)|"
+    r"minimal(?:ly)?|little|neither|nor|rather than)\b[\w\s,'’-]{0,25}$",
+    re.IGNORECASE,
+)
+
+# Rule-based clickbait indicators in a report that also mark a category
+INDICATOR_LABELS = {
+    "Uses clickbait phrases": "clickbait",
+    "Uses emotional language": "emotional",
+}
+
+# Reports without a critique are labelled sensational from their score
+SENSATIONAL_SCORE = 50
+
+REPORT_TITLE = re.compile(r"^# Critical Analysis Report for: (.+)$", re.MULTILINE)
+REPORT_SCORE = re.compile(r"^\*\*Sensationalism Score\*\*: (\d+)/100", re.MULTILINE)
+REPORT_CRITIQUE = re.compile(
+    r"^## Headline Analysis\n(.*?)(?=^\*\*Sensationalism Score\*\*|^## )",
+    re.MULTILINE | re.DOTALL,
+)
+REPORT_INDICATORS = re.compile(
+    r"^\*\*Clickbait Indicators\*\*:\n((?:\* .*\n?)*)", re.MULTILINE
+)
+
+# Critiques that are placeholders rather than LLM output
+PLACEHOLDER_CRITIQUE = re.compile(
+    r"^(?:LLM (?:analysis|critique)|Local headline model|No headline)", re.IGNORECASE
+)
+
+TOKEN = re.compile(r"[a-z0-9]+(?:['’][a-z]+)?")
+N_FEATURES = 2**15
+
+
+def hash_features(title, n_features=N_FEATURES):
+    """
+    Map a headline to the hashed indices of its n-gram features.
+
+    Features are lowercased word unigrams and bigrams plus the character
+    trigrams of each word (so unseen inflections share features with known
+    ones). crc32 is used as the hash, which is stable across processes.
+
+    Returns:
+        list: Sorted, distinct feature indices below n_features
+    """
+    words = TOKEN.findall(title.lower())
+    grams = ["w:" + word for word in words]
+    grams += ["b:" + first + " " + second for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += ["c:" + padded[i : i + 3] for i in range(len(padded) - 2)]
+    return sorted({zlib.crc32(gram.encode("utf-8")) % n_features for gram in grams})
+
+
+def _feature_matrix(titles, n_features):
+    """Return (row starts, feature indices, feature values) for the titles."""
+    import numpy as np
+
+    indices, values, starts = [], [], []
+    for title in titles:
+        features = hash_features(title, n_features) or [0]
+        starts.append(len(indices))
+        indices.extend(features)
+        # Scale each row to unit length so long titles don't dominate
+        values.extend([1 / math.sqrt(len(features))] * len(features))
+    return (
+        np.array(starts, dtype=np.int64),
+        np.array(indices, dtype=np.int64),
+        np.array(values, dtype=np.float32),
+    )
+
+
+def _mentions(text, pattern):
+    """Return True if the pattern occurs in text without a negation before it."""
+    for match in pattern.finditer(text):
+        sentence_start = max(
+            text.rfind(".", 0, match.start()), text.rfind("\n", 0, match.start())
+        )
+        if not NEGATION.search(text, sentence_start + 1, match.start()):
+            return True
+    return False
+
+
+def parse_report(text):
+    """
+    Extract a training example from a markdown analysis report.
+
+    Returns:
+        tuple: (title, {label: 0 or 1}), or None if the report has no title
+            or no usable headline assessment
+    """
+    title = REPORT_TITLE.search(text)
+    if not title:
+        return None
+    critique = REPORT_CRITIQUE.search(text)
+    critique = critique.group(1).strip() if critique else ""
+    if PLACEHOLDER_CRITIQUE.match(critique):
+        critique = ""
+    score = REPORT_SCORE.search(text)
+    if not critique and not score:
+        return None
+
+    targets = {label: 0 for label in LABELS}
+    if critique:
+        for label, pattern in LABEL_PATTERNS.items():
+            targets[label] = int(_mentions(critique, pattern))
+    elif int(score.group(1)) >= SENSATIONAL_SCORE:
+        targets["sensational"] = 1
+
+    indicators = REPORT_INDICATORS.search(text)
+    for line in indicators.group(1).splitlines() if indicators else []:
+        for prefix, label in INDICATOR_LABELS.items():
+            if line[2:].startswith(prefix):
+                targets[label] = 1
+    return title.group(1).strip(), targets
+
+
+def load_training_reports(reports_dir):
+    """
+    Read the training examples from every *.md report in a directory.
+
+    Returns:
+        tuple: (titles, targets) with one {label: 0 or 1} dict per title
+    """
+    titles, targets = [], []
+    for path in sorted(glob.glob(os.path.join(reports_dir, "*.md"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                example = parse_report(f.read())
+        except OSError as e:
+            print(f"Skipping unreadable report {path}: {e}")
+            continue
+        if example:
+            titles.append(example[0])
+            targets.append(example[1])
+    return titles, targets
+
+
+class HeadlineClassifier:
+    """
+    Logistic regression over hashed headline n-grams, one output per label.
+
+    The weights are a (n_features + 1, len(labels)) float32 array whose
+    last row holds the biases. It is saved with np.save, next to a small
+    JSON file with the labels and training summary, and loaded
+    memory-mapped so only the rows a headline touches are read.
+    """
+
+    def __init__(self, weights, labels=LABELS, info=None):
+        self.weights = weights
+        self.labels = list(labels)
+        self.n_features = weights.shape[0] - 1
+        self.info = info or {}
+
+    @classmethod
+    def train(
+        cls,
+        titles,
+        targets,
+        n_features=N_FEATURES,
+        epochs=300,
+        learning_rate=0.5,
+        l2=1e-4,
+    ):
+        """
+        Fit the classifier with full-batch Adagrad on the logistic loss.
+
+        Args:
+            titles: List of headlines
+            targets: One {label: 0 or 1} dict per headline
+            n_features: Size of the hashed feature space
+            epochs: Number of passes over the data
+            learning_rate: Adagrad step size
+            l2: L2 regularization strength
+
+        Returns:
+            HeadlineClassifier: The trained model
+        """
+        import numpy as np
+
+        if not titles:
+            raise ValueError("No training examples")
+        starts, indices, values = _feature_matrix(titles, n_features)
+        rows = np.repeat(
+            np.arange(len(titles)), np.diff(np.append(starts, len(indices)))
+        )
+        y = np.array(
+            [[target[label] for label in LABELS] for target in targets],
+            dtype=np.float32,
+        )
+
+        weights = np.zeros((n_features + 1, len(LABELS)), dtype=np.float32)
+        squared = np.full_like(weights, 1e-8)
+        for _ in range(epochs):
+            logits = _logits(weights, starts, indices, values)
+            error = (_sigmoid(logits) - y) / len(titles)
+            gradient = np.empty_like(weights)
+            for column in range(len(LABELS)):
+                gradient[:-1, column] = np.bincount(
+                    indices,
+                    weights=error[rows, column] * values,
+                    minlength=n_features,
+                )
+            gradient[:-1] += l2 * weights[:-1]
+            gradient[-1] = error.sum(axis=0)
+            squared += gradient**2
+            weights -= learning_rate * gradient / np.sqrt(squared)
+
+        predicted = _sigmoid(_logits(weights, starts, indices, values)) >= 0.5
+        info = {
+            "examples": len(titles),
+            "positives": dict(zip(LABELS, y.sum(axis=0).astype(int).tolist())),
+            "training_accuracy": dict(
+                zip(LABELS, (predicted == y).mean(axis=0).round(3).tolist())
+            ),
+        }
+        return cls(weights, LABELS, info)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """Load a saved model, memory-mapping the weight array."""
+        import numpy as np
+
+        # A plain array view of the memory map (no copy) indexes faster
+        weights = np.asarray(np.load(path, mmap_mode="r"))
+        with open(_info_path(path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if weights.shape[1] != len(meta["labels"]):
+            raise ValueError(f"{path} does not match its label file")
+        return cls(weights, meta["labels"], meta.get("info"))
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        import numpy as np
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.save(path, np.asarray(self.weights, dtype=np.float32))
+        with open(_info_path(path), "w", encoding="utf-8") as f:
+            json.dump({"labels": self.labels, "info": self.info}, f, indent=2)
+
+    def predict(self, title):
+        """Return {label: probability} for one headline."""
+        return dict(zip(self.labels, self.predict_many([title])[0].tolist()))
+
+    def predict_many(self, titles):
+        """
+        Return the label probabilities of many headlines.
+
+        Returns:
+            numpy.ndarray: (len(titles), len(labels)) probabilities
+        """
+        starts, indices, values = _feature_matrix(titles, self.n_features)
+        return _sigmoid(_logits(self.weights, starts, indices, values))
+
+    def describe(self, probabilities):
+        """Summarize a headline's label probabilities as a short critique."""
+        names = {
+            "sensational": "sensationalist",
+            "clickbait": "clickbait",
+            "emotional": "emotionally charged language",
+            "biased_framing": "biased or misleading framing",
+        }
+        parts = [
+            f"{names.get(label, label)} {probabilities[label]:.0%}"
+            for label in self.labels
+        ]
+        examples = self.info.get("examples")
+        trained_on = f" (trained on {examples} reports)" if examples else ""
+        return (
+            f"Local headline model assessment{trained_on}, probability of: "
+            f"{', '.join(parts)}. Run without --headline-model for a detailed "
+            "LLM critique."
+        )
+
+
+def _logits(weights, starts, indices, values):
+    import numpy as np
+
+    contributions = weights[indices] * values[:, None]
+    return np.add.reduceat(contributions, starts, axis=0) + weights[-1]
+
+
+def _sigmoid(x):
+    import numpy as np
+
+    return 1 / (1 + np.exp(-np.clip(x, -30, 30)))
+
+
+def _info_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def train_headline_model(reports_dir, path=DEFAULT_MODEL_PATH, **options):
+    """
+    Train a headline classifier from the reports in reports_dir and save it.
+
+    Args:
+        reports_dir: Directory with markdown analysis reports
+        path: Where to save the weight array (the labels go next to it)
+        **options: Training options passed to HeadlineClassifier.train
+
+    Returns:
+        HeadlineClassifier: The trained model
+    """
+    titles, targets = load_training_reports(reports_dir)
+    if not titles:
+        raise ValueError(f"No reports with a headline assessment in {reports_dir}")
+    classifier = HeadlineClassifier.train(titles, targets, **options)
+    classifier.save(path)
+    return classifier
+
+
+_classifier = None
+
+
+def configure_headline_classifier(path=None):
+    """
+    Load the classifier used instead of the LLM headline critique.
+
+    Args:
+        path: Saved model to load, or None to go back to the LLM critique
+    """
+    global _classifier
+    _classifier = HeadlineClassifier.load(path) if path else None
+
+
+def get_headline_classifier():
+    """Return the configured HeadlineClassifier, or None if there is none."""
+    return _classifier
@@ -0,0 +1,323 @@
+import re
+from collections import Counter
+
+# Sentence boundary: terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace and an uppercase letter, digit or opening quote
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"'”’)\]]*\s+(?=[\"'“‘(\[]?[A-Z0-9])")
+
+# Abbreviations that end in a period without ending the sentence
+ABBREVIATIONS = frozenset(
+    "mr mrs ms dr prof sen rep gov gen col lt sgt st jr sr inc corp co ltd vs "
+    "jan feb mar apr jun jul aug sep sept oct nov dec no u.s u.k e.g i.e".split()
+)
+
+WORD = re.compile(r"[a-z]+(?:['’][a-z]+)?")
+NUMBER = re.compile(r"\d[\d,.]*\s*(?:%|percent\b|million\b|billion\b|trillion\b)?")
+
+# Capitalized word sequences, allowing one short connector inside a name
+# ("Bank of England", "University of Leeds")
+PROPER_NOUN = re.compile(
+    r"\b[A-Z][\w’'&.-]*[a-zA-Z]"
+    r"(?:\s+(?:(?:of|for|de|la|von|van|del)\s+)?[A-Z][\w’'&.-]*[a-zA-Z])*"
+)
+
+# Text just before a word that starts a sentence (searched in a short window)
+SENTENCE_START = re.compile(r"(?:[.!?:;\"“”‘(]\s*|\n\s*)$")
+
+# Quoted speech, which is left out of tone scoring
+QUOTATION = re.compile(r"“[^”]*”|\"[^\"\n]*\"")
+
+REPORTING_VERBS = frozenset(
+    "said says say told stated announced reported according claimed claims "
+    "found showed shows estimated estimates confirmed revealed published "
+    "concluded warned argued added noted testified wrote approved voted "
+    "increased decreased rose fell".split()
+)
+
+# Attribution to unnamed sources
+ANONYMOUS_SOURCES = re.compile(
+    r"\b(?:sources? (?:said|say|says|told|familiar)|anonymous(?:ly)?|"
+    r"unnamed (?:source|official)s?|people familiar with|"
+    r"on condition of anonymity|insiders?)\b",
+    re.IGNORECASE,
+)
+
+# Tone lexicons, matched against lowercased word tokens
+EMOTIONAL_WORDS = frozenset(
+    "shocking outrageous devastating terrifying horrifying catastrophic "
+    "disgraceful disgusting appalling explosive bombshell scandal scandalous "
+    "stunning incredible unbelievable amazing alarming chaos chaotic crisis "
+    "disaster nightmare furious slammed blasted destroyed slams blasts "
+    "brutal heartbreaking tragic outrage fury panic".split()
+)
+OPINION_WORDS = frozenset(
+    "i we our my should must ought believe think feel opinion clearly "
+    "obviously undoubtedly surely frankly arguably".split()
+)
+ABSOLUTE_WORDS = frozenset(
+    "always never everyone nobody everything nothing none completely "
+    "totally entirely undeniable proven".split()
+)
+HEDGE_WORDS = frozenset(
+    "may might could possibly perhaps suggests suggest appears appear "
+    "likely unlikely reportedly allegedly estimated approximately".split()
+)
+
+# Capitalized words that start sentences rather than name entities
+COMMON_CAPITALIZED = frozenset(
+    "The A An This That These Those It Its In On At For From By With And But Or "
+    "If When While After Before As He She They We I You His Her Their Our "
+    "There Here Some Many Most More Other Such What Who Why How Which Where "
+    "Monday Tuesday Wednesday Thursday Friday Saturday Sunday January February "
+    "March April May June July August September October November December "
+    "Mr Mrs Ms Dr Prof However Meanwhile Also Still Yet Even Only One Two Three".split()
+)
+
+MAX_CLAIMS = 5
+MAX_ENTITIES = 8
+
+
+def split_sentences(text):
+    """
+    Split text into sentences.
+
+    Paragraph breaks always end a sentence. Within a paragraph, text is
+    split after ".", "!" or "?" when the next word starts with an uppercase
+    letter or digit, except after common abbreviations such as "Dr." or
+    "U.S.".
+    """
+    sentences = []
+    for paragraph in text.split("\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(paragraph):
+            candidate = paragraph[start : match.start()]
+            last_word = candidate.rsplit(None, 1)[-1] if candidate else ""
+            if last_word.rstrip(".").lower() in ABBREVIATIONS:
+                continue
+            sentences.append(paragraph[start : match.end()].strip())
+            start = match.end()
+        if start < len(paragraph):
+            sentences.append(paragraph[start:].strip())
+    return sentences
+
+
+def extract_claims(sentences, limit=MAX_CLAIMS):
+    """
+    Pick the sentences that read most like factual claims.
+
+    Sentences score for reporting verbs ("said", "according to", "found")
+    and for numbers, percentages and amounts. The best `limit` sentences are
+    returned in their original order.
+    """
+    scored = []
+    for index, sentence in enumerate(sentences):
+        words = WORD.findall(sentence.lower())
+        if len(words) < 6:
+            continue
+        score = sum(1 for word in words if word in REPORTING_VERBS)
+        score += 1.5 * len(NUMBER.findall(sentence))
+        if score:
+            scored.append((score, index, sentence))
+
+    best = sorted(scored, key=lambda item: (-item[0], item[1]))[:limit]
+    return [sentence for _, _, sentence in sorted(best, key=lambda item: item[1])]
+
+
+def extract_entities(text, limit=MAX_ENTITIES):
+    """
+    Find names of people, organizations and places.
+
+    Multi-word capitalized sequences ("University of Leeds") are kept
+    together, leading articles and common words are dropped, and names are
+    ranked by how often they occur. A single capitalized word at the start
+    of a sentence only counts if it is also capitalized elsewhere, and a
+    word that is part of a longer name found in the text (e.g. "Okafor" in
+    "Samuel Okafor") is counted towards the longer name.
+    """
+    counts = Counter()
+    initial = Counter()  # single words seen only at the start of a sentence
+    for match in PROPER_NOUN.finditer(text):
+        start = match.start()
+        at_sentence_start = start == 0 or bool(
+            SENTENCE_START.search(text, max(0, start - 4), start)
+        )
+        words = match.group().split()
+        while words and words[0].rstrip(".") in COMMON_CAPITALIZED:
+            words.pop(0)
+            at_sentence_start = False
+        if not words:
+            continue
+        name = " ".join(words).rstrip(".'’")
+        if len(name) < 2:
+            continue
+        if at_sentence_start and " " not in name:
+            initial[name] += 1
+        else:
+            counts[name] += 1
+
+    # Fold single words into the multi-word names that contain them
+    parts = {}
+    for name in counts:
+        if " " in name:
+            for word in name.split():
+                parts.setdefault(word, name)
+    for name, count in initial.items():
+        if name in parts or name in counts:
+            counts[parts.get(name, name)] += count
+    for name in [name for name in counts if " " not in name and name in parts]:
+        counts[parts[name]] += counts.pop(name)
+
+    ranked = sorted(counts.items(), key=lambda item: -item[1])
+    return [name for name, _ in ranked[:limit]]
+
+
+def score_tone(words):
+    """
+    Score the tone of a tokenized text against the tone lexicons.
+
+    Returns:
+        dict: Per-1000-word rates of emotional, opinion, absolute and
+            hedging words, plus a "label" (neutral, emotional, persuasive
+            or opinion-based)
+    """
+    total = len(words) or 1
+    counts = Counter(words)
+
+    def rate(lexicon):
+        return 1000 * sum(counts[word] for word in lexicon if word in counts) / total
+
+    scores = {
+        "emotional": rate(EMOTIONAL_WORDS),
+        "opinion": rate(OPINION_WORDS),
+        "absolute": rate(ABSOLUTE_WORDS),
+        "hedging": rate(HEDGE_WORDS),
+    }
+    if scores["opinion"] >= 12:
+        label = "opinion-based"
+    elif scores["emotional"] >= 8:
+        label = "emotional"
+    elif scores["absolute"] + scores["opinion"] >= 10:
+        label = "persuasive"
+    else:
+        label = "neutral"
+    scores["label"] = label
+    return scores
+
+
+def content_tone(content):
+    """Score the tone of the article's own voice, leaving out quoted speech."""
+    return score_tone(WORD.findall(QUOTATION.sub(" ", content).lower()))
+
+
+def analyze_offline(article_data):
+    """
+    Analyze an article locally, without any LLM calls.
+
+    Claims, entities, tone and red flags are derived from the text with
+    the heuristics above. The result has the same keys as the LLM analysis.
+
+    Args:
+        article_data: Dictionary containing article information
+
+    Returns:
+        dict: A dictionary containing the structured analysis components
+    """
+    title = article_data.get("title") or ""
+    content = article_data.get("content") or ""
+
+    sentences = split_sentences(content)
+    words = WORD.findall(content.lower())
+    claims = extract_claims(sentences)
+    entities = extract_entities(content)
+    tone = content_tone(content)
+
+    attributed = sum(
+        1
+        for sentence in sentences
+        if "according to" in sentence.lower()
+        or any(word in REPORTING_VERBS for word in WORD.findall(sentence.lower()))
+    )
+    numbers = len(NUMBER.findall(content))
+    anonymous = len(ANONYMOUS_SOURCES.findall(content))
+
+    red_flags = []
+    if tone["emotional"] >= 8:
+        red_flags.append(
+            "Frequent emotionally charged words, which can push readers towards a conclusion"
+        )
+    if tone["absolute"] >= 6:
+        red_flags.append(
+            "Absolute language ('always', 'never', 'everyone') that leaves no room for nuance"
+        )
+    if tone["opinion"] >= 12:
+        red_flags.append("Opinion and first-person statements mixed into reporting")
+    if anonymous:
+        red_flags.append(
+            f"Relies on unnamed or anonymous sources ({anonymous} mention(s))"
+        )
+    if sentences and attributed / len(sentences) < 0.1:
+        red_flags.append("Few statements are attributed to a named source or study")
+    if len(words) > 150 and not numbers:
+        red_flags.append("No figures or data are given to support the claims")
+    if content.count("!") >= 3:
+        red_flags.append("Repeated exclamation marks")
+    if not red_flags:
+        red_flags.append(
+            "No obvious red flags detected by the offline heuristics - still read critically"
+        )
+
+    questions = []
+    if claims:
+        questions.append(
+            f'What is the original source for the claim: "{_shorten(claims[0])}"?'
+        )
+    if numbers:
+        questions.append(
+            "Where do the figures come from, and are they presented with their full context?"
+        )
+    if entities:
+        questions.append(
+            f"What do other sources report about {entities[0]}, and is their role described accurately?"
+        )
+    if anonymous:
+        questions.append(
+            "Can the claims attributed to unnamed sources be confirmed on the record?"
+        )
+    questions.append("What perspectives might be missing from this reporting?")
+
+    if tone["label"] == "neutral":
+        counter = (
+            "The article reads as largely neutral. A critic might still ask which "
+            "voices were not quoted and whether the selection of facts favours one side."
+        )
+    else:
+        counter = (
+            f"The article's {tone['label']} tone may amplify one side of the story. "
+            "A reader with the opposing view might argue the same facts support a "
+            "less dramatic conclusion, and would look for the evidence left out."
+        )
+
+    return {
+        "core_claims": claims
+        or [f"The article discusses {title}" if title else "No factual claims found"],
+        "language_tone": (
+            f"{tone['label'].capitalize()} (offline estimate): "
+            f"{tone['emotional']:.0f} emotional, {tone['opinion']:.0f} opinion, "
+            f"{tone['absolute']:.0f} absolute and {tone['hedging']:.0f} hedging "
+            "words per 1000 words."
+        ),
+        "red_flags": red_flags,
+        "verification_questions": questions[:4],
+        "key_entities": [
+            f"{entity} - Consider researching this entity's background"
+            for entity in entities
+        ],
+        "counter_argument": counter,
+    }
+
+
+def _shorten(sentence, limit=120):
+    return sentence if len(sentence) <= limit else sentence[: limit - 3] + "..."
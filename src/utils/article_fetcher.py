@@ -1,50 +1,163 @@
-import requests
-from bs4 import BeautifulSoup
+import importlib.util
 import os
+from .page_cache import fetch_page
+from .content_extractor import Bs4Adapter, LxmlAdapter, extract_main_text
+
+# lxml is optional (BeautifulSoup's html.parser is the fallback) and, like
+# bs4, is only imported when a page is parsed, to keep startup fast
+HAVE_LXML = importlib.util.find_spec("lxml") is not None
+
+AUTHOR_SELECTOR = '.author, .byline, [rel="author"], [name="author"]'
+DATE_SELECTOR = (
+    'time, [datetime], .date, .published, [property="article:published_time"]'
+)
+CONTAINER_SELECTOR = "article, .article, .content, .post, main"
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of the CSS selectors above, for the lxml fast path.
+# Union-style predicates keep document order, like soup.select().
+AUTHOR_XPATH = (
+    f"//*[{_has_class('author')} or {_has_class('byline')}"
+    " or @rel='author' or @name='author']"
+)
+DATE_XPATH = (
+    f"//*[self::time or @datetime or {_has_class('date')}"
+    f" or {_has_class('published')} or @property='article:published_time']"
+)
+CONTAINER_XPATH = (
+    f"//*[self::article or {_has_class('article')} or {_has_class('content')}"
+    f" or {_has_class('post')} or self::main]"
+)
 
 
 def fetch_article_content(url):
     """Fetch the content of an article from a given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        # Remove script, style elements and comments
-        for element in soup(["script", "style"]):
-            element.decompose()
-
-        # Extract article title
-        title = soup.title.string if soup.title else "Unknown Title"
-
-        # Try to extract the author's name if available
-        author = None
-        author_elements = soup.select(
-            '.author, .byline, [rel="author"], [name="author"]'
-        )
-        if author_elements:
-            author = author_elements[0].get_text().strip()
-
-        # Try to extract the publication date if available
-        date = None
-        date_elements = soup.select(
-            'time, [datetime], .date, .published, [property="article:published_time"]'
-        )
-        if date_elements:
-            date = date_elements[0].get_text().strip()
-            if not date and date_elements[0].has_attr("datetime"):
-                date = date_elements[0]["datetime"]
-
-        # Try to find article content - this is a simplified approach
-        # In real-world scenario, you'd need more sophisticated content extraction
-        article_text = ""
+        html = fetch_page(url)
+        article = extract_article(html)
+        article["url"] = url
+        return article
+    except Exception as e:
+        print(f"Error fetching article: {e}")
+        return None
+
+
+def extract_article(html):
+    """
+    Extract title, author, date and body text from an article page.
+
+    Uses the lxml fast path when lxml is installed and falls back to
+    BeautifulSoup's html.parser otherwise (or if lxml cannot parse the page
+    or finds no body text).
+
+    Args:
+        html: Raw page content (bytes or str)
+
+    Returns:
+        dict: A dictionary with "title", "content", "author" and "date"
+    """
+    if HAVE_LXML:
+        from lxml import etree
+
+        try:
+            article = extract_article_lxml(html)
+        except (etree.ParserError, ValueError):
+            article = None
+        # libxml2 drops markup nested deeper than about 255 levels, which can
+        # leave no body text at all; html.parser has no such limit
+        if article and article["content"].strip():
+            return article
+    return extract_article_bs4(html)
+
+
+def extract_article_lxml(html):
+    """
+    Extract article fields with lxml, touching only the nodes that are needed.
+
+    The document is parsed in C and only the title, the first author/date
+    matches and the selected paragraphs are turned into Python strings.
+    """
+    import lxml.html as lxml_html
+    from lxml import etree
+
+    doc = lxml_html.document_fromstring(html)
+
+    # Remove script and style elements so they never leak into paragraph text
+    etree.strip_elements(doc, "script", "style", with_tail=False)
 
+    # Extract article title
+    title = doc.findtext(".//title") or "Unknown Title"
+
+    # Try to extract the author's name if available
+    author = None
+    author_elements = doc.xpath(AUTHOR_XPATH)
+    if author_elements:
+        author = author_elements[0].text_content().strip()
+
+    # Try to extract the publication date if available
+    date = None
+    date_elements = doc.xpath(DATE_XPATH)
+    if date_elements:
+        date = date_elements[0].text_content().strip()
+        if not date and date_elements[0].get("datetime") is not None:
+            date = date_elements[0].get("datetime")
+
+    # Score blocks by text/link density; fall back to the first common
+    # article container (or every paragraph in the page)
+    article_text = extract_main_text(doc, LxmlAdapter())
+    if article_text is None:
+        article_containers = doc.xpath(CONTAINER_XPATH)
+        if article_containers:
+            paragraphs = article_containers[0].iter("p")
+        else:
+            paragraphs = doc.iter("p")
+        article_text = " ".join(p.text_content().strip() for p in paragraphs)
+
+    return {
+        "title": title.strip(),
+        "content": article_text,
+        "author": author,
+        "date": date,
+    }
+
+
+def extract_article_bs4(html):
+    """Extract article fields with BeautifulSoup's pure-Python html.parser."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove script, style elements and comments
+    for element in soup(["script", "style"]):
+        element.decompose()
+
+    # Extract article title
+    title = soup.title.string if soup.title else "Unknown Title"
+
+    # Try to extract the author's name if available
+    author = None
+    author_elements = soup.select(AUTHOR_SELECTOR)
+    if author_elements:
+        author = author_elements[0].get_text().strip()
+
+    # Try to extract the publication date if available
+    date = None
+    date_elements = soup.select(DATE_SELECTOR)
+    if date_elements:
+        date = date_elements[0].get_text().strip()
+        if not date and date_elements[0].has_attr("datetime"):
+            date = date_elements[0]["datetime"]
+
+    # Score blocks by text/link density to find the article body
+    article_text = extract_main_text(soup, Bs4Adapter())
+
+    if article_text is None:
         # Look for common article containers
-        article_containers = soup.select("article, .article, .content, .post, main")
+        article_containers = soup.select(CONTAINER_SELECTOR)
         if article_containers:
             # Use the first article container found
             content_container = article_containers[0]
@@ -56,16 +169,12 @@ def fetch_article_content(url):
             paragraphs = soup.find_all("p")
             article_text = " ".join([p.get_text().strip() for p in paragraphs])
 
-        return {
-            "title": title.strip(),
-            "content": article_text,
-            "url": url,
-            "author": author,
-            "date": date,
-        }
-    except Exception as e:
-        print(f"Error fetching article: {e}")
-        return None
+    return {
+        "title": title.strip(),
+        "content": article_text,
+        "author": author,
+        "date": date,
+    }
 
 
 def read_article_from_file(file_path):
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    Per-model health tracking for the LLM fallback chain.
+
+    A model's breaker opens after `failure_threshold` consecutive failures,
+    and requests skip it in favour of the next healthy model. Once `cooldown`
+    seconds have passed, a single probe request is let through (half-open):
+    success closes the breaker again, failure re-opens it for another cooldown.
+
+    If `state_path` is given, breaker state is saved there as JSON whenever
+    it changes and loaded on start, so it persists across runs.
+    """
+
+    def __init__(self, failure_threshold=3, cooldown=120.0, state_path=None):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state_path = state_path
+        self._models = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _entry(self, model):
+        return self._models.setdefault(
+            model, {"state": CLOSED, "failures": 0, "opened_at": None, "probing": False}
+        )
+
+    def allow(self, model):
+        """Return True if a request may be sent to `model` now."""
+        with self._lock:
+            entry = self._entry(model)
+            if entry["state"] == CLOSED:
+                return True
+            if entry["state"] == OPEN:
+                if time.time() - entry["opened_at"] < self.cooldown:
+                    return False
+                entry["state"] = HALF_OPEN
+                entry["probing"] = False
+            # Half-open: only one probe request at a time
+            if entry["probing"]:
+                return False
+            entry["probing"] = True
+            return True
+
+    def record_success(self, model):
+        with self._lock:
+            entry = self._entry(model)
+            changed = entry["state"] != CLOSED
+            entry.update(state=CLOSED, failures=0, opened_at=None, probing=False)
+            if changed:
+                print(f"Model {model} recovered; routing requests to it again.")
+                self._save()
+
+    def record_failure(self, model):
+        with self._lock:
+            entry = self._entry(model)
+            entry["failures"] += 1
+            entry["probing"] = False
+            if (
+                entry["state"] == HALF_OPEN
+                or entry["failures"] >= self.failure_threshold
+            ):
+                if entry["state"] != OPEN:
+                    print(
+                        f"Model {model} failed {entry['failures']} time(s); "
+                        f"skipping it for {self.cooldown:g}s."
+                    )
+                entry["state"] = OPEN
+                entry["opened_at"] = time.time()
+                self._save()
+
+    def states(self):
+        """Return {model: state} for every model seen so far."""
+        with self._lock:
+            return {model: entry["state"] for model, entry in self._models.items()}
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable circuit breaker state: {e}")
+            return
+        for model, entry in saved.items():
+            self._models[model] = {
+                "state": entry.get("state", CLOSED),
+                "failures": entry.get("failures", 0),
+                "opened_at": entry.get("opened_at"),
+                "probing": False,
+            }
+            if self._models[model]["state"] != CLOSED:
+                # A probe from a previous run never finished; wait out a cooldown
+                self._models[model]["state"] = OPEN
+                self._models[model]["opened_at"] = entry.get("opened_at") or time.time()
+
+    def _save(self):
+        if not self.state_path:
+            return
+        state = {
+            model: {
+                "state": entry["state"],
+                "failures": entry["failures"],
+                "opened_at": entry["opened_at"],
+            }
+            for model, entry in self._models.items()
+        }
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+        except OSError as e:
+            print(f"Could not save circuit breaker state: {e}")
+
+
+_breaker = CircuitBreaker()
+
+
+def configure_circuit_breaker(failure_threshold=3, cooldown=120.0, state_path=None):
+    """Replace the shared breaker (e.g. to persist its state to `state_path`)."""
+    global _breaker
+    _breaker = CircuitBreaker(failure_threshold, cooldown, state_path)
+
+
+def get_circuit_breaker():
+    """Return the process-wide CircuitBreaker."""
+    return _breaker
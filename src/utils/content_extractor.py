@@ -0,0 +1,272 @@
+import re
+
+# Elements that never hold article body text
+SKIP_TAGS = {
+    "script",
+    "style",
+    "noscript",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "form",
+    "button",
+    "select",
+    "iframe",
+    "svg",
+    "figure",
+}
+
+# Blocks that can hold the article body
+CANDIDATE_TAGS = {"div", "article", "main", "section", "td", "body", "blockquote"}
+
+# Elements whose text counts as a paragraph of body text
+PARAGRAPH_TAGS = {"p", "pre"}
+
+# class/id hints for boilerplate and for body text
+NEGATIVE_HINTS = re.compile(
+    r"comment|sidebar|related|footer|footnote|\bnav|menu|share|social|promo|"
+    r"\bads?\b|advert|sponsor|newsletter|subscribe|signup|\btags?\b|breadcrumb|"
+    r"popular|most-read|\bmore\b|masthead|cookie|banner|outbrain|taboola",
+    re.IGNORECASE,
+)
+POSITIVE_HINTS = re.compile(
+    r"article|\bbody|content|entry|\bmain|\bpost|story|\btext", re.IGNORECASE
+)
+
+MIN_PARAGRAPH_LENGTH = 25
+MAX_PARAGRAPH_LINK_DENSITY = 0.5
+
+# Groups of selected paragraphs that are on average shorter than this share of
+# the paragraphs of the largest group are dropped (teaser and headline lists)
+MIN_PARAGRAPH_LENGTH_RATIO = 0.5
+
+
+class _Block:
+    __slots__ = ("parent", "weight", "score", "text_len", "link_len")
+
+    def __init__(self, parent, weight):
+        self.parent = parent
+        self.weight = weight
+        self.score = 0.0
+        self.text_len = 0
+        self.link_len = 0
+
+
+class _Frame:
+    """Walk state of an element whose children are still being visited."""
+
+    __slots__ = (
+        "children",
+        "path",
+        "in_link",
+        "parts",
+        "is_paragraph",
+        "block",
+        "text_len",
+        "link_len",
+    )
+
+    def __init__(self, children, path, in_link, parts, is_paragraph, block):
+        self.children = children
+        self.path = path
+        self.in_link = in_link
+        self.parts = parts
+        self.is_paragraph = is_paragraph
+        self.block = block
+        self.text_len = 0
+        self.link_len = 0
+
+
+class LxmlAdapter:
+    """Uniform access to tag names, class/id hints and children of an lxml tree."""
+
+    def tag(self, node):
+        tag = node.tag
+        # Comments and processing instructions have a non-string tag
+        return tag.lower() if isinstance(tag, str) else None
+
+    def hints(self, node):
+        return f"{node.get('class', '')} {node.get('id', '')}"
+
+    def children(self, node):
+        """Yield child elements and text strings in document order."""
+        if node.text:
+            yield node.text
+        for child in node:
+            yield child
+            if child.tail:
+                yield child.tail
+
+
+class Bs4Adapter:
+    """The LxmlAdapter interface for a BeautifulSoup tree."""
+
+    def __init__(self):
+        from bs4.element import NavigableString, PreformattedString, Tag
+
+        self._string = NavigableString
+        self._special = PreformattedString  # comments, doctypes, CDATA
+        self._tag = Tag
+
+    def tag(self, node):
+        return node.name
+
+    def hints(self, node):
+        classes = node.get("class") or []
+        if isinstance(classes, str):
+            classes = [classes]
+        return f"{' '.join(classes)} {node.get('id') or ''}"
+
+    def children(self, node):
+        for child in node.children:
+            if isinstance(child, self._tag):
+                yield child
+            elif isinstance(child, self._string) and not isinstance(
+                child, self._special
+            ):
+                yield str(child)
+
+
+def extract_main_text(root, adapter):
+    """
+    Return the main body text of a page using text- and link-density scoring.
+
+    The tree is walked once. Every element gets its text and link-text
+    lengths, and each substantial paragraph adds a score to its parent and
+    (at half weight) its grandparent block. The best block, weighted by
+    class/id hints and penalized by its link density, is taken as the
+    article body, together with sibling blocks that score at least a fifth
+    as well. Groups of paragraphs much shorter than those of the largest
+    group (a column of teasers beside the story) are then left out.
+    Navigation, comments, related links and other boilerplate are skipped.
+
+    Args:
+        root: Root element of a parsed document (lxml or BeautifulSoup)
+        adapter: LxmlAdapter or Bs4Adapter matching the tree type
+
+    Returns:
+        str: Body paragraphs separated by blank lines, or None if no
+            paragraph of body text was found
+    """
+    blocks = {}
+    paragraphs = []  # (text, keys of enclosing blocks)
+
+    def enter(node, path, in_link, parts):
+        # Returns the walk state of an element, or None if it is skipped
+        tag = adapter.tag(node)
+        if tag is None or tag in SKIP_TAGS:
+            return None
+
+        hints = adapter.hints(node)
+        weight = 1.0
+        if hints.strip():
+            negative = NEGATIVE_HINTS.search(hints)
+            positive = POSITIVE_HINTS.search(hints)
+            if negative and not positive and tag not in ("body", "html"):
+                return None
+            if positive:
+                weight = 1.25
+
+        block = None
+        if tag in CANDIDATE_TAGS:
+            # Blocks are numbered in document order: id() of an lxml element
+            # is reused once the walk has moved past it and its proxy is freed
+            key = len(blocks)
+            block = _Block(path[-1] if path else None, weight)
+            blocks[key] = block
+            path = path + (key,)
+
+        is_paragraph = tag in PARAGRAPH_TAGS and parts is None
+        if is_paragraph:
+            parts = []
+        return _Frame(
+            iter(adapter.children(node)),
+            path,
+            in_link or tag == "a",
+            parts,
+            is_paragraph,
+            block,
+        )
+
+    def leave(frame):
+        text_len, link_len, path = frame.text_len, frame.link_len, frame.path
+        if frame.block is not None:
+            frame.block.text_len = text_len
+            frame.block.link_len = link_len
+
+        if frame.is_paragraph and text_len >= MIN_PARAGRAPH_LENGTH:
+            if link_len / text_len < MAX_PARAGRAPH_LINK_DENSITY:
+                text = " ".join("".join(frame.parts).split())
+                paragraphs.append((text, path))
+                score = 1 + text.count(",") + min(len(text) // 100, 3)
+                if path:
+                    blocks[path[-1]].score += score
+                if len(path) > 1:
+                    blocks[path[-2]].score += score / 2
+
+    # Depth-first walk with an explicit stack, so deeply nested pages cannot
+    # exhaust the interpreter's recursion limit
+    root_frame = enter(root, (), False, None)
+    stack = [root_frame] if root_frame else []
+    while stack:
+        frame = stack[-1]
+        for child in frame.children:
+            if isinstance(child, str):
+                length = len(child.strip())
+                frame.text_len += length
+                if frame.in_link:
+                    frame.link_len += length
+                if frame.parts is not None:
+                    frame.parts.append(child)
+                continue
+            child_frame = enter(child, frame.path, frame.in_link, frame.parts)
+            if child_frame is not None:
+                stack.append(child_frame)
+                break
+        else:
+            stack.pop()
+            leave(frame)
+            if stack:
+                stack[-1].text_len += frame.text_len
+                stack[-1].link_len += frame.link_len
+
+    best_id, best_score = None, 0.0
+    final_scores = {}
+    for block_id, block in blocks.items():
+        if not block.score:
+            continue
+        link_density = block.link_len / block.text_len if block.text_len else 1.0
+        final_scores[block_id] = block.score * block.weight * (1 - link_density)
+        if final_scores[block_id] > best_score:
+            best_id, best_score = block_id, final_scores[block_id]
+
+    if best_id is None:
+        return None
+
+    # Include sibling blocks that carry a comparable amount of body text
+    parent = blocks[best_id].parent
+    selected = {best_id}
+    threshold = max(10.0, best_score * 0.2)
+    for block_id, score in final_scores.items():
+        if blocks[block_id].parent == parent and score >= threshold:
+            selected.add(block_id)
+
+    body = [(text, path) for text, path in paragraphs if selected.intersection(path)]
+
+    # Drop groups of short paragraphs, such as a list of teasers, that came
+    # along with the story. A group is the paragraphs sharing their nearest
+    # block; it is kept if its mean paragraph length reaches a share of that
+    # of the group holding the most text.
+    groups = {}
+    for text, path in body:
+        groups.setdefault(path[-1], []).append(len(text))
+    largest = max(groups.values(), key=sum)
+    typical = sum(largest) / len(largest)
+    kept = {
+        group
+        for group, sizes in groups.items()
+        if sum(sizes) / len(sizes) >= typical * MIN_PARAGRAPH_LENGTH_RATIO
+    }
+    body = [text for text, path in body if path[-1] in kept]
+    return "\n\n".join(body) or None
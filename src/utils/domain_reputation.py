@@ -0,0 +1,220 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "domains.sqlite3")
+DEFAULT_SOURCE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "domain_reputation.csv",
+)
+
+# Credibility factor for each rating in the source list
+RATING_FACTORS = {
+    "wire": "Source is an established news agency",
+    "public_broadcaster": "Source is a public broadcaster",
+    "established": "Source is an established news organization",
+    "journal": "Source is a scientific or medical journal",
+    "fact_check": "Source is a fact-checking organization",
+    "official": "Source is an official government or intergovernmental site",
+    "academic": "Source is an academic institution",
+    "satire": "Source publishes satire; its articles are not meant as factual reporting",
+    "user_generated": "Source hosts user-generated content; standards depend on the individual author",
+    "low": "Source is listed as having published false or misleading content",
+}
+
+
+def reverse_domain(domain):
+    """Return the labels of a domain in reverse order ("bbc.co.uk" -> "uk.co.bbc")."""
+    return ".".join(reversed(domain.split(".")))
+
+
+def normalize_host(host):
+    """Lowercase a host name and drop any port, credentials and trailing dot."""
+    host = (host or "").strip().lower().rsplit("@", 1)[-1]
+    if host.startswith("["):
+        return host  # IPv6 literal
+    return host.split(":", 1)[0].rstrip(".")
+
+
+def read_source_list(path):
+    """
+    Read a domain list from CSV or JSON.
+
+    CSV files need "domain" and "rating" columns and may have a
+    "description" column. JSON files hold either a list of such objects or
+    a {domain: {"rating": ..., "description": ...}} mapping.
+
+    Returns:
+        list: (domain, rating, description) tuples
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = [dict(entry, domain=domain) for domain, entry in data.items()]
+        else:
+            data = list(csv.DictReader(f))
+
+    entries = []
+    for entry in data:
+        domain = normalize_host(entry.get("domain"))
+        rating = (entry.get("rating") or "").strip().lower()
+        if not domain or not rating:
+            continue
+        entries.append((domain, rating, (entry.get("description") or "").strip()))
+    return entries
+
+
+class DomainReputationIndex:
+    """
+    On-disk index of domain reputations with suffix matching.
+
+    Domains are stored in SQLite under their reversed labels
+    ("uk.co.bbc"), which is the primary key, so looking up a host probes the
+    index once per label suffix: "news.bbc.co.uk" resolves through
+    "bbc.co.uk" and "cdc.gov" through "gov", preferring the longest match.
+    The index is rebuilt whenever the source list changes, and recent
+    lookups are kept in an in-process LRU cache.
+    """
+
+    def __init__(
+        self, path=DEFAULT_INDEX_PATH, source_path=DEFAULT_SOURCE_PATH, cache_size=4096
+    ):
+        self.path = path
+        self.source_path = source_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not self._is_current():
+            self._build()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _source_version(self):
+        stat = os.stat(self.source_path)
+        return f"{os.path.abspath(self.source_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _is_current(self):
+        if not os.path.exists(self.path):
+            return False
+        conn = sqlite3.connect(self.path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        except sqlite3.Error:
+            return False
+        finally:
+            conn.close()
+        return bool(row) and row[0] == self._source_version()
+
+    def _build(self):
+        """Build the index from the source list, replacing any old index."""
+        entries = read_source_list(self.source_path)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with sqlite3.connect(tmp_path) as conn:
+            conn.execute("""
+                CREATE TABLE domains (
+                    reversed TEXT PRIMARY KEY,
+                    domain TEXT NOT NULL,
+                    rating TEXT NOT NULL,
+                    description TEXT NOT NULL
+                ) WITHOUT ROWID
+                """)
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.executemany(
+                "INSERT OR REPLACE INTO domains VALUES (?, ?, ?, ?)",
+                [
+                    (reverse_domain(domain), domain, rating, description)
+                    for domain, rating, description in entries
+                ],
+            )
+            conn.execute(
+                "INSERT INTO meta VALUES ('source', ?)", (self._source_version(),)
+            )
+        conn.close()
+        os.replace(tmp_path, self.path)
+
+    def _lookup(self, host):
+        host = normalize_host(host)
+        if not host:
+            return None
+        labels = host.split(".")
+        suffixes = [reverse_domain(".".join(labels[i:])) for i in range(len(labels))]
+        with self._lock:
+            row = self._conn.execute(
+                f"""
+                SELECT domain, rating, description FROM domains
+                WHERE reversed IN ({", ".join("?" * len(suffixes))})
+                ORDER BY length(reversed) DESC LIMIT 1
+                """,
+                suffixes,
+            ).fetchone()
+        if not row:
+            return None
+        return {"domain": row[0], "rating": row[1], "description": row[2]}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM domains").fetchone()[0]
+
+
+_settings = {
+    "enabled": True,
+    "path": DEFAULT_INDEX_PATH,
+    "source_path": DEFAULT_SOURCE_PATH,
+}
+_index = None
+_index_lock = threading.Lock()
+
+
+def configure_domain_reputation(**options):
+    """
+    Update domain reputation settings.
+
+    Args:
+        **options: Any of enabled, path (index file), source_path (CSV or
+            JSON domain list)
+    """
+    global _index
+    with _index_lock:
+        _settings.update(options)
+        _index = None
+
+
+def get_domain_reputation_index():
+    """Return the shared DomainReputationIndex, or None when it is disabled."""
+    global _index
+    if not _settings["enabled"]:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DomainReputationIndex(
+                    _settings["path"], _settings["source_path"]
+                )
+    return _index
+
+
+def lookup_domain_reputation(host):
+    """
+    Look up the reputation of a host in the shared index.
+
+    Returns:
+        dict: "domain" (the matching list entry), "rating" and
+            "description", or None if the host is not listed or the index is
+            unavailable
+    """
+    try:
+        index = get_domain_reputation_index()
+    except (OSError, sqlite3.Error, ValueError) as e:
+        print(f"Domain reputation index unavailable: {e}")
+        configure_domain_reputation(enabled=False)
+        return None
+    reputation = index.lookup(host) if index else None
+    # Copy, as the cached dict is shared by every lookup of the same host
+    return dict(reputation) if reputation else None
@@ -0,0 +1,160 @@
+import threading
+
+# requests and urllib3 are imported when the first session is built, so
+# runs that never touch the network do not pay for loading them
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+# Status codes that are worth retrying with backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_config = {
+    "connect_timeout": 5.0,
+    "read_timeout": 20.0,
+    "retries": 3,
+    "backoff_factor": 0.5,
+    "pool_connections": 32,
+    "pool_maxsize": 16,
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+# Counters carried over from pools the pool manager has already discarded
+_retired_stats = {"opened": 0, "requests": 0}
+_stats_lock = threading.Lock()
+
+
+def _retire_pool(pool):
+    with _stats_lock:
+        _retired_stats["opened"] += pool.num_connections
+        _retired_stats["requests"] += pool.num_requests
+
+
+def _track_evicted_pools(adapter):
+    """Keep the connection counters of host pools the adapter discards."""
+    pools = adapter.poolmanager.pools
+    dispose_func = pools.dispose_func
+
+    def dispose(pool):
+        _retire_pool(pool)
+        if dispose_func:
+            dispose_func(pool)
+
+    pools.dispose_func = dispose
+
+
+def configure_http_client(**options):
+    """
+    Update the shared HTTP client settings.
+
+    Args:
+        **options: Any of connect_timeout, read_timeout, retries,
+            backoff_factor, pool_connections, pool_maxsize
+
+    The shared session is rebuilt on next use so new settings take effect.
+    """
+    global _session
+    unknown = set(options) - set(_config)
+    if unknown:
+        raise ValueError(f"Unknown HTTP client options: {', '.join(sorted(unknown))}")
+
+    with _session_lock:
+        _config.update({k: v for k, v in options.items() if v is not None})
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _build_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import make_headers
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=_config["retries"],
+        connect=_config["retries"],
+        read=_config["retries"],
+        status=_config["retries"],
+        backoff_factor=_config["backoff_factor"],
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=_config["pool_connections"],
+        pool_maxsize=_config["pool_maxsize"],
+        max_retries=retry,
+    )
+    _track_evicted_pools(adapter)
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # gzip/deflate always, plus br/zstd when brotli or zstandard is installed
+    session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)[
+        "accept-encoding"
+    ]
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide keep-alive session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def http_get(url, headers=None, **kwargs):
+    """
+    GET a URL through the shared session with the configured timeouts.
+
+    Args:
+        url: The URL to fetch
+        headers: Extra headers merged over the defaults
+        **kwargs: Passed through to requests (e.g. params, timeout)
+
+    Returns:
+        requests.Response: The response (5xx/429 already retried with backoff)
+    """
+    kwargs.setdefault("timeout", (_config["connect_timeout"], _config["read_timeout"]))
+    return get_session().get(url, headers=headers, **kwargs)
+
+
+def get_connection_stats():
+    """
+    Return connection reuse counters for the shared session.
+
+    Returns:
+        dict: Connections opened, requests sent and connections reused
+    """
+    with _stats_lock:
+        opened = _retired_stats["opened"]
+        sent = _retired_stats["requests"]
+
+    session = _session
+    if session is not None:
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen or not hasattr(adapter, "poolmanager"):
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    sent += pool.num_requests
+
+    return {
+        "connections_opened": opened,
+        "requests_sent": sent,
+        "connections_reused": max(sent - opened, 0),
+    }
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm.sqlite3")
+
+
+def prompt_key(model, temperature, prompt):
+    """Content address of an LLM request: hash of (model, temperature, prompt)."""
+    payload = json.dumps([model, float(temperature), prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed store of LLM responses keyed by prompt_key().
+
+    Entries expire after `ttl` seconds, and the least recently used entries
+    are evicted once the store holds more than `max_entries` responses.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=7 * 24 * 3600, max_entries=10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, model, temperature, prompt):
+        """Return the cached response text, or None on a miss or expired entry."""
+        return self.get_first([model], temperature, prompt)[1]
+
+    def get_first(self, models, temperature, prompt):
+        """
+        Look up a request for several models in one query.
+
+        Counts as a single hit or miss, however many models are tried.
+
+        Returns:
+            tuple: (model, response text) for the first model in `models`
+                with a live entry, or (None, None)
+        """
+        keys = [prompt_key(model, temperature, prompt) for model in models]
+        now = time.time()
+        with self._lock:
+            rows = {
+                key: (response, created_at)
+                for key, response, created_at in self._conn.execute(
+                    "SELECT key, response, created_at FROM responses "
+                    f"WHERE key IN ({', '.join('?' * len(keys))})",
+                    keys,
+                )
+            }
+            expired = [key for key, row in rows.items() if now - row[1] >= self.ttl]
+            if expired:
+                self._conn.executemany(
+                    "DELETE FROM responses WHERE key = ?", [(key,) for key in expired]
+                )
+            for model, key in zip(models, keys):
+                if key in rows and key not in expired:
+                    self._conn.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                    self._conn.commit()
+                    self.stats["hits"] += 1
+                    return model, rows[key][0]
+
+            if expired:
+                self._conn.commit()
+            self.stats["misses"] += 1
+            return None, None
+
+    def put(self, model, temperature, prompt, response):
+        """Store a response, then drop expired and least recently used entries."""
+        key = prompt_key(model, temperature, prompt)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                self._conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY accessed_at LIMIT ?
+                    )
+                    """,
+                    (excess,),
+                )
+                self.stats["evicted"] += excess
+            self._conn.commit()
+
+
+_settings = {
+    "enabled": True,
+    "path": DEFAULT_CACHE_PATH,
+    "ttl": 7 * 24 * 3600,
+    "max_entries": 10000,
+}
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure_llm_cache(**options):
+    """
+    Update LLM cache settings.
+
+    Args:
+        **options: Any of enabled, path, ttl (seconds), max_entries
+    """
+    global _cache
+    with _cache_lock:
+        _settings.update(options)
+        _cache = None
+
+
+def get_llm_cache():
+    """Return the shared LLMCache, or None when caching is disabled."""
+    global _cache
+    if not _settings["enabled"]:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache(
+                    _settings["path"], _settings["ttl"], _settings["max_entries"]
+                )
+    return _cache
+
+
+def get_cached_response(model, temperature, prompt):
+    """Look up a previous response for an identical request, if caching is on."""
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    return cache.get(model, temperature, prompt)
+
+
+def find_cached_response(models, temperature, prompt):
+    """
+    Look up a previous response to a request from any of `models`.
+
+    Returns:
+        tuple: (model, response text), or (None, None) on a miss or when
+            caching is off
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return None, None
+    return cache.get_first(models, temperature, prompt)
+
+
+def store_response(model, temperature, prompt, response):
+    """Remember a response for later identical requests, if caching is on."""
+    cache = get_llm_cache()
+    if cache is not None and response:
+        cache.put(model, temperature, prompt, response)
+
+
+def cached_invoke(model, temperature, prompt, invoke):
+    """
+    Return the cached response for a request, or call `invoke` and cache it.
+
+    Args:
+        model: Model name used for the request
+        temperature: Sampling temperature used for the request
+        prompt: The fully formatted prompt text
+        invoke: Zero-argument callable that sends the request and returns text
+
+    Returns:
+        str: The response text
+    """
+    response = get_cached_response(model, temperature, prompt)
+    if response is None:
+        response = invoke()
+        store_response(model, temperature, prompt, response)
+    return response
+
+
+def get_llm_cache_stats():
+    """Return hit/miss/eviction counters for the LLM cache."""
+    cache = _cache
+    if cache is None:
+        return {"hits": 0, "misses": 0, "evicted": 0}
+    return dict(cache.stats)
@@ -0,0 +1,254 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from .http_client import http_get
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "pages.sqlite3")
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def normalize_url(url):
+    """
+    Normalize a URL so equivalent spellings share one cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not (
+        (scheme == "http" and port == 80) or (scheme == "https" and port == 443)
+    ):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class PageCache:
+    """
+    SQLite-backed cache of fetched pages with size-bounded LRU eviction.
+
+    Entries keep the response body along with its ETag and Last-Modified
+    validators so stale pages can be revalidated instead of re-downloaded.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=256 * 1024 * 1024, ttl=3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "evicted": 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)"
+        )
+        self._conn.commit()
+        self._total_size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()[0]
+
+    def record(self, event):
+        """Increment one of the hit/revalidated/misses counters."""
+        with self._lock:
+            self.stats[event] += 1
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url):
+        """Return the cached entry for a URL as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM pages WHERE key = ?",
+                (self._key(url),),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "body": row[0],
+            "etag": row[1],
+            "last_modified": row[2],
+            "fetched_at": row[3],
+        }
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def touch(self, url, refetched=False):
+        """Mark an entry as recently used (and revalidated, if refetched)."""
+        now = time.time()
+        with self._lock:
+            if refetched:
+                self._conn.execute(
+                    "UPDATE pages SET accessed_at = ?, fetched_at = ? WHERE key = ?",
+                    (now, now, self._key(url)),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE pages SET accessed_at = ? WHERE key = ?",
+                    (now, self._key(url)),
+                )
+            self._conn.commit()
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Store a page body with its validators, evicting old entries if needed."""
+        key = self._key(url)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if old:
+                self._total_size -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    normalize_url(url),
+                    sqlite3.Binary(body),
+                    etag,
+                    last_modified,
+                    now,
+                    now,
+                    len(body),
+                ),
+            )
+            self._total_size += len(body)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Drop least recently used pages until the cache fits its budget
+        while self._total_size > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM pages ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if not row:
+                break
+            self._conn.execute("DELETE FROM pages WHERE key = ?", (row[0],))
+            self._total_size -= row[1]
+            self.stats["evicted"] += 1
+
+
+_settings = {
+    "enabled": True,
+    "refresh": False,
+    "path": DEFAULT_CACHE_PATH,
+    "max_bytes": 256 * 1024 * 1024,
+    "ttl": 3600,
+}
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure_page_cache(**options):
+    """
+    Update page cache settings.
+
+    Args:
+        **options: Any of enabled, refresh (ignore cached bodies but store
+            fresh ones), path, max_bytes, ttl (seconds a page is served
+            without revalidation)
+    """
+    global _cache
+    with _cache_lock:
+        _settings.update(options)
+        _cache = None
+
+
+def get_page_cache():
+    """Return the shared PageCache, or None when caching is disabled."""
+    global _cache
+    if not _settings["enabled"]:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PageCache(
+                    _settings["path"], _settings["max_bytes"], _settings["ttl"]
+                )
+    return _cache
+
+
+def fetch_page(url):
+    """
+    Fetch a page body, serving and revalidating it through the page cache.
+
+    Fresh cache hits are served without network access. Stale entries are
+    revalidated with If-None-Match/If-Modified-Since.
+
+    Returns:
+        bytes: The (decoded) response body
+
+    Raises:
+        requests.HTTPError: If the server returns an error status
+    """
+    cache = get_page_cache()
+    entry = None
+    if cache is not None and not _settings["refresh"]:
+        entry = cache.get(url)
+
+    headers = {}
+    if entry:
+        if cache.is_fresh(entry):
+            cache.record("hits")
+            cache.touch(url)
+            return entry["body"]
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = http_get(url, headers=headers or None)
+
+    if entry and response.status_code == 304:
+        cache.record("revalidated")
+        cache.touch(url, refetched=True)
+        return entry["body"]
+
+    response.raise_for_status()
+    body = response.content
+    if cache is not None:
+        cache.record("misses")
+        cache.put(
+            url,
+            body,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    return body
+
+
+def get_page_cache_stats():
+    """Return hit/revalidation/miss counters for the page cache."""
+    cache = _cache
+    if cache is None:
+        return {"hits": 0, "revalidated": 0, "misses": 0, "evicted": 0}
+    return dict(cache.stats)
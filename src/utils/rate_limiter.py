@@ -0,0 +1,128 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    The bucket holds at most `capacity` units (one minute's worth by default),
+    so short bursts are allowed without exceeding the per-minute rate.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._available = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._available = min(self.capacity, self._available + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self, amount):
+        """
+        Take `amount` units from the bucket, going into debt if necessary.
+
+        Returns:
+            float: Seconds the caller must wait before the units are available
+        """
+        # Never ask for more than the bucket can hold, or we would wait forever
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._available -= amount
+            if self._available >= 0:
+                return 0.0
+            return -self._available / self.rate
+
+
+class RateLimiter:
+    """
+    Process-wide limiter for LLM requests, with per-model request and token budgets.
+
+    Every call reserves one request and its estimated prompt tokens from the
+    model's buckets and sleeps until both budgets allow it, so concurrent
+    analyzers share the quota instead of all hitting 429 errors at once.
+    """
+
+    def __init__(self, requests_per_minute=60, tokens_per_minute=1000000, limits=None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.limits = dict(limits or {})
+        self.stats = {"calls": 0, "throttled": 0, "wait_seconds": 0.0}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _model_buckets(self, model):
+        with self._lock:
+            buckets = self._buckets.get(model)
+            if buckets is None:
+                rpm, tpm = self.limits.get(
+                    model, (self.requests_per_minute, self.tokens_per_minute)
+                )
+                buckets = (
+                    TokenBucket(rpm) if rpm else None,
+                    TokenBucket(tpm) if tpm else None,
+                )
+                self._buckets[model] = buckets
+            return buckets
+
+    def acquire(self, model, tokens=0):
+        """
+        Block until a request of `tokens` prompt tokens may be sent to `model`.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        request_bucket, token_bucket = self._model_buckets(model)
+        wait = 0.0
+        if request_bucket is not None:
+            wait = max(wait, request_bucket.reserve(1))
+        if token_bucket is not None and tokens:
+            wait = max(wait, token_bucket.reserve(tokens))
+
+        with self._lock:
+            self.stats["calls"] += 1
+            if wait > 0:
+                self.stats["throttled"] += 1
+                self.stats["wait_seconds"] += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_limiter = RateLimiter()
+
+
+def configure_rate_limiter(
+    requests_per_minute=None, tokens_per_minute=None, limits=None
+):
+    """
+    Replace the shared limiter's budgets.
+
+    Args:
+        requests_per_minute: Default requests/minute per model (0 = unlimited)
+        tokens_per_minute: Default prompt tokens/minute per model (0 = unlimited)
+        limits: Optional {model: (requests_per_minute, tokens_per_minute)} overrides
+    """
+    global _limiter
+    if requests_per_minute is None:
+        requests_per_minute = _limiter.requests_per_minute
+    if tokens_per_minute is None:
+        tokens_per_minute = _limiter.tokens_per_minute
+    if limits is None:
+        limits = _limiter.limits
+    _limiter = RateLimiter(requests_per_minute, tokens_per_minute, limits)
+
+
+def get_rate_limiter():
+    """Return the process-wide RateLimiter."""
+    return _limiter
+
+
+def get_rate_limiter_stats():
+    """Return how many calls were throttled and for how long in total."""
+    return dict(_limiter.stats)
@@ -117,6 +117,61 @@ def generate_markdown_report(
     return markdown
 
 
+# Report headings of the analysis components, in report order
+SECTION_TITLES = {
+    "headline_analysis": "Headline Analysis",
+    "core_claims": "Core Claims",
+    "language_tone": "Language & Tone Analysis",
+    "red_flags": "Potential Red Flags",
+    "verification_questions": "Verification Questions",
+    "key_entities": "Key Entities to Investigate",
+    "counter_argument": "Counter-Argument Perspective",
+}
+
+
+def render_section(key, value):
+    """Render one analysis component as a Markdown section."""
+    markdown = f"## {SECTION_TITLES.get(key, key.replace('_', ' ').title())}\n"
+    if isinstance(value, list):
+        for i, item in enumerate(value, 1):
+            if key == "verification_questions":
+                markdown += f"{i}. {item}\n"
+            else:
+                markdown += f"* {item}\n"
+    else:
+        markdown += f"{value}\n"
+    return markdown + "\n"
+
+
+class ProgressiveReportWriter:
+    """
+    Append analysis sections to a Markdown report, and echo them to stdout,
+    as they are produced.
+
+    The file is a preview while the analysis runs; it is replaced by the
+    complete report from generate_markdown_report once all stages finish.
+    """
+
+    def __init__(self, article_data, output_path, echo=True):
+        self.output_path = output_path
+        self.echo = echo
+        header = f"# Critical Analysis Report for: {article_data['title']}\n\n"
+        header += f"Source: {article_data['url']}\n\n"
+        header += "_Analysis in progress..._\n\n"
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(header)
+
+    def add_section(self, key, value):
+        if key not in SECTION_TITLES:
+            return
+        section = render_section(key, value)
+        with open(self.output_path, "a", encoding="utf-8") as f:
+            f.write(section)
+        if self.echo:
+            print(section, end="", flush=True)
+
+
 def save_report(report, output_path="analysis_report.md"):
     """Save the analysis report to a file."""
     # Ensure the directory exists
@@ -1,26 +1,392 @@
-def extract_section(text, section_name):
-    """Helper function to extract sections from a raw text response."""
+import json
+import re
+
+# A heading line: "### Title", "**Title**", "**Title:**", "1. **Title**:",
+# "2) Title:" or "Title:", optionally followed by text after the colon
+HEADING = re.compile(
+    r"^(?:(?P<hashes>#{1,6})\s*)?(?:(?P<number>\d{1,2})[.)]\s+)?"
+    r"(?P<bold>\*\*|__)?\s*(?P<title>[A-Za-z][\w &'/,()-]{0,60})"
+    r"(?P<colon1>:)?\s*(?(bold)(?:\*\*|__))\s*(?P<colon2>:)?\s*(?P<rest>.*)$"
+)
+
+# Bullet or number prefix of a list item
+LIST_MARKER = re.compile(r"^(?:[*\-•+]|\d{1,2}[.)])\s+")
+
+# Sections of the analysis prompt; list sections hold items, and the
+# numbered section holds questions
+LIST_SECTIONS = {"core claims", "potential red flags", "key entities analysis"}
+NUMBERED_SECTIONS = {"verification questions"}
+KNOWN_SECTIONS = (
+    LIST_SECTIONS
+    | NUMBERED_SECTIONS
+    | {
+        "language and tone analysis",
+        "counter argument simulation",
+        "headline analysis",
+    }
+)
+
+# Characters that open a JSON string in repair_json: the plain quote, then
+# the curly quotes LLMs sometimes use as delimiters
+SMART_QUOTES = '"\u201c\u201d'
+
+
+def normalize_heading(title):
+    """Lowercase a heading and spell out "&", for tolerant lookups."""
+    title = title.lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z0-9 ]+", " ", title).split())
+
+
+def parse_sections(text):
+    """
+    Split a Markdown-style LLM response into its sections in one pass.
+
+    Headings may be written as "## Title", "**Title**", "1. **Title**:",
+    "2) Title:" and similar; text after a heading's colon starts the
+    section body. Lines without "#" or bold markup only count as headings
+    when they end in a colon (numbered lines) or name one of the analysis
+    sections, so list items and "Label: text" lines stay in their section.
+
+    Args:
+        text: The raw response text
+
+    Returns:
+        dict: {normalized heading: [stripped non-empty body lines]} in
+            document order
+    """
+    sections = {}
+    current = None
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        match = HEADING.match(stripped)
+        if match:
+            title = normalize_heading(match.group("title"))
+            colon = match.group("colon1") or match.group("colon2")
+            rest = match.group("rest").strip()
+            marked = match.group("hashes") or match.group("bold")
+            if rest and not colon:
+                is_heading = False
+            elif marked:
+                is_heading = True
+            elif match.group("number"):
+                is_heading = bool(colon) and (not rest or title in KNOWN_SECTIONS)
+            else:
+                is_heading = bool(colon) and title in KNOWN_SECTIONS
+            if is_heading:
+                current = sections.setdefault(title, [])
+                if rest:
+                    current.append(rest)
+                continue
+        if current is not None:
+            current.append(stripped)
+    return sections
+
+
+def find_section(sections, section_name):
+    """
+    Return the body lines of a section parsed by parse_sections.
+
+    The exact (normalized) heading wins; otherwise a heading that contains
+    the name or is contained in it (e.g. "Key Entities" for "Key Entities
+    Analysis"). Returns None if no heading matches.
+    """
+    name = normalize_heading(section_name)
+    if name in sections:
+        return sections[name]
+    for title, lines in sections.items():
+        if title and (name in title or title in name):
+            return lines
+    return None
+
+
+def extract_section(text, section_name, sections=None):
+    """
+    Helper function to extract sections from a raw text response.
+
+    Args:
+        text: The raw response text
+        section_name: Heading of the section to extract
+        sections: Result of parse_sections(text), to avoid re-parsing when
+            several sections are extracted from the same response
+
+    Returns:
+        list or str: Items of list sections (claims, red flags, entities,
+            questions), the text of other sections, or [] if not found
+    """
     if not text:
         return []
+    if sections is None:
+        sections = parse_sections(text)
+
+    lines = find_section(sections, section_name)
+    if not lines:
+        return []
+    name = normalize_heading(section_name)
+    if name in LIST_SECTIONS or name in NUMBERED_SECTIONS:
+        return [LIST_MARKER.sub("", line, count=1).strip() for line in lines]
+    return "\n".join(lines)
+
+
+def _json_candidate(text):
+    fenced = re.search(r"```(?:json)?\s*(.*?)(?:```|$)", text, re.DOTALL)
+    if fenced and "{" in fenced.group(1):
+        text = fenced.group(1)
+    start = text.find("{")
+    return text[start:] if start >= 0 else None
+
+
+def repair_json(text):
+    """
+    Parse the JSON object in an LLM response, repairing common slips.
+
+    The object may be wrapped in a ```json fence or surrounded by prose.
+    Smart quotes around keys/values, // comments, trailing and missing
+    commas, raw newlines inside strings, Python literals (True/False/None)
+    and a response cut off before its closing quotes and brackets are
+    fixed in a single pass.
+
+    Returns:
+        dict: The parsed object, or None if it still cannot be parsed
+    """
+    candidate = _json_candidate(text or "")
+    if candidate is None:
+        return None
+    try:
+        value, _ = json.JSONDecoder().raw_decode(candidate)
+        return value if isinstance(value, dict) else None
+    except ValueError:
+        pass
+
+    out = []
+    stack = []
+    in_string = False
+    # The characters that close the open string: a string opened with a
+    # smart quote is closed by one; otherwise smart quotes are plain text
+    closers = '"'
+    escape = False
+    # True after a complete value, when only ",", ":" or a closer may follow
+    after_value = False
+    i = 0
+    length = len(candidate)
+    while i < length:
+        char = candidate[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char in closers:
+                char = '"'
+                in_string = False
+                after_value = True
+            elif char == "\n":
+                char = "\\n"
+            elif char == "\t":
+                char = "\\t"
+            out.append(char)
+            i += 1
+            continue
+
+        if char.isspace():
+            out.append(char)
+        elif char == "/" and candidate.startswith("//", i):
+            newline = candidate.find("\n", i)
+            i = length if newline < 0 else newline
+            continue
+        elif char in SMART_QUOTES or char in "{[":
+            if after_value:
+                out.append(",")
+            if char in SMART_QUOTES:
+                closers = '"' if char == '"' else SMART_QUOTES[1:]
+                char = '"'
+                in_string = True
+            else:
+                stack.append("}" if char == "{" else "]")
+            after_value = False
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+            after_value = True
+            if not stack:
+                break
+        elif char in ",:":
+            after_value = False
+            out.append(char)
+        else:
+            word = re.match(r"[\w.+-]+", candidate[i:])
+            token = word.group() if word else char
+            if after_value:
+                out.append(",")
+            out.append(
+                {"True": "true", "False": "false", "None": "null"}.get(token, token)
+            )
+            after_value = True
+            i += len(token)
+            continue
+        i += 1
+
+    # The response was cut off: close the open string, then the brackets
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    _drop_trailing_comma(out)
+    last = _last_token(out)
+    if last is not None and out[last].rstrip().endswith(":"):
+        out.append("null")
+    out.extend(reversed(stack))
+    try:
+        value = json.loads("".join(out))
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _last_token(out):
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    return index if index >= 0 else None
+
+
+def _drop_trailing_comma(out):
+    index = _last_token(out)
+    if index is not None and out[index] == ",":
+        del out[index]
+
+
+def estimate_tokens(text):
+    """Rough token count for LLM prompts (about four characters per token)."""
+    return len(text) // 4 + 1 if text else 0
+
+
+def split_into_chunks(text, max_tokens):
+    """
+    Split text into paragraph-aligned chunks of at most max_tokens tokens.
+
+    Paragraphs (separated by blank lines, or single newlines when there are
+    no blank lines) are packed greedily. A paragraph that is too long on its
+    own is split at sentence boundaries.
+
+    Args:
+        text: The text to split
+        max_tokens: Approximate upper bound on tokens per chunk
+
+    Returns:
+        list: Chunks of text in their original order
+    """
+    if not text:
+        return []
+
+    separator = "\n\n" if "\n\n" in text else "\n"
+    paragraphs = [p.strip() for p in text.split(separator) if p.strip()]
+
+    pieces = []
+    for paragraph in paragraphs:
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        sentences = re.split(r"(?<=[.!?])\s+", paragraph)
+        current = ""
+        for sentence in sentences:
+            if current and estimate_tokens(current + " " + sentence) > max_tokens:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            pieces.append(current)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and estimate_tokens(current + "\n\n" + piece) > max_tokens:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class StreamingSectionParser:
+    """
+    Pick completed top-level fields out of a JSON object as it is streamed.
+
+    Text is fed in arbitrary pieces; feed() returns every (key, value) pair
+    whose value finished in that piece. Anything before the opening brace
+    (such as a ```json fence) is ignored, and a value that is not valid
+    JSON is skipped rather than reported.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+
+    def feed(self, text):
+        """Consume the next piece of the response and return completed fields."""
+        self._buffer += text
+        completed = []
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = self._loads(buffer[self._key_start : i + 1])
+                        self._key_start = None
+                continue
+
+            if self._depth == 0:
+                if char == "{" and self._key is None:
+                    self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = i
+            elif char == ":" and self._depth == 1 and self._key is not None:
+                self._value_start = i + 1
+            elif char in "{[":
+                self._depth += 1
+            elif char in "]}":
+                if self._depth == 1:
+                    self._finish_value(buffer[self._value_start : i], completed)
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                self._finish_value(buffer[self._value_start : i], completed)
+        self._pos = len(buffer)
+        return completed
+
+    def _finish_value(self, raw, completed):
+        if self._value_start is not None:
+            value = self._loads(raw)
+            if value is not None and isinstance(self._key, str):
+                completed.append((self._key, value))
+        self._key = None
+        self._value_start = None
 
-    sections = text.split("###")
-    for section in sections:
-        if section_name.lower() in section.lower():
-            lines = [line.strip() for line in section.split("\n") if line.strip()]
-            if len(lines) > 1:
-                if section_name in [
-                    "Core Claims",
-                    "Potential Red Flags",
-                    "Key Entities Analysis",
-                ]:
-                    return [
-                        item[2:].strip() for item in lines[1:] if item.startswith("* ")
-                    ]
-                elif section_name == "Verification Questions":
-                    return [
-                        item[item.find(".") + 1 :].strip() if "." in item else item
-                        for item in lines[1:]
-                    ]
-                else:
-                    return "\n".join(lines[1:])
-    return []
+    @staticmethod
+    def _loads(raw):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None